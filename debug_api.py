@@ -4,16 +4,85 @@ Debug script for Recall API connectivity
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import sys
 import os
+import orjson
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import repeat
 sys.path.append('src')
 
 from src.config import Config
 
+# Shared session so all probes reuse keep-alive connections to the API host.
+# Transient gateway errors are retried with backoff; POSTs are not retried so
+# a test trade is never submitted twice.
+retry = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=["GET"],
+    respect_retry_after_header=True
+)
+session = requests.Session()
+session.mount("https://", HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=20))
+
+# Endpoint used to decide whether a base URL is worth a full endpoint sweep
+RESOLVE_ENDPOINT = "/account/portfolio"
+
+def probe_status(url, headers):
+    """Return the status code of a GET request, or None if it failed"""
+    try:
+        # Stream so the body is never downloaded - only the status matters here
+        with session.get(url, headers=headers, timeout=10, stream=True) as response:
+            return response.status_code
+    except Exception:
+        return None
+
+def probe_endpoint(url, headers):
+    """Probe a single authenticated endpoint and return the report lines"""
+    lines = []
+    try:
+        # Stream the response so error pages are only read up to the snippet size
+        with session.get(url, headers=headers, timeout=10, stream=True) as response:
+            lines.extend(describe_response(url, response))
+            
+    except Exception as e:
+        lines.append(f"   {url} -> EXCEPTION: {e}")
+    return lines
+
+def describe_response(url, response):
+    """Build the report lines for a streamed endpoint response"""
+    lines = [f"   {url} -> {response.status_code}"]
+    
+    if response.status_code == 200:
+        try:
+            data = orjson.loads(response.content)
+            lines.append(f"      SUCCESS: {data}")
+        except:
+            lines.append(f"      SUCCESS: {response.text[:100]}...")
+    elif response.status_code in [401, 403]:
+        try:
+            error = orjson.loads(response.content)
+            lines.append(f"      AUTH ERROR: {error}")
+        except:
+            lines.append(f"      AUTH ERROR: {response.text[:100]}...")
+    elif response.status_code == 404:
+        lines.append(f"      NOT FOUND")
+    else:
+        lines.append(f"      ERROR: {body_snippet(response)}...")
+    return lines
+
+def body_snippet(response, limit=100):
+    """Read at most `limit` bytes of a streamed response body"""
+    return response.raw.read(limit, decode_content=True).decode("utf-8", "replace")
+
 def test_api_endpoints():
     """Test various API endpoints to determine the correct format"""
     
     api_key = Config.TRADING_SIM_API_KEY
+    # Sent per request so the health probes below stay unauthenticated
     headers = {
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json"
@@ -54,40 +123,28 @@ def test_api_endpoints():
     print("1. Testing health endpoints (no auth required):")
     for base_url in base_urls:
         try:
-            response = requests.get(f"{base_url}/health", timeout=10)
+            response = session.get(f"{base_url}/health", timeout=10)
             print(f"   {base_url}/health -> {response.status_code}")
             if response.status_code == 200:
-                print(f"      Response: {response.json()}")
+                print(f"      Response: {orjson.loads(response.content)}")
         except Exception as e:
             print(f"   {base_url}/health -> ERROR: {e}")
     
     print("\n2. Testing authenticated endpoints:")
-    for base_url in base_urls:
-        for endpoint in endpoints[1:]:  # Skip health
-            try:
-                url = f"{base_url}{endpoint}"
-                response = requests.get(url, headers=headers, timeout=10)
-                print(f"   {url} -> {response.status_code}")
-                
-                if response.status_code == 200:
-                    try:
-                        data = response.json()
-                        print(f"      SUCCESS: {data}")
-                    except:
-                        print(f"      SUCCESS: {response.text[:100]}...")
-                elif response.status_code in [401, 403]:
-                    try:
-                        error = response.json()
-                        print(f"      AUTH ERROR: {error}")
-                    except:
-                        print(f"      AUTH ERROR: {response.text[:100]}...")
-                elif response.status_code == 404:
-                    print(f"      NOT FOUND")
-                else:
-                    print(f"      ERROR: {response.text[:100]}...")
-                    
-            except Exception as e:
-                print(f"   {url} -> EXCEPTION: {e}")
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        # Only sweep base URLs that actually serve the API
+        statuses = executor.map(probe_status, [f"{base_url}{RESOLVE_ENDPOINT}" for base_url in base_urls], repeat(headers))
+        live_base_urls = []
+        for base_url, status in zip(base_urls, statuses):
+            if status == 404:
+                print(f"   {base_url}{RESOLVE_ENDPOINT} -> 404, skipping {base_url}")
+            else:
+                live_base_urls.append(base_url)
+        
+        urls = [f"{base_url}{endpoint}" for base_url in live_base_urls for endpoint in endpoints[1:]]  # Skip health
+        futures = [executor.submit(probe_endpoint, url, headers) for url in urls]
+        for future in as_completed(futures):
+            print("\n".join(future.result()))
     
     print("\n3. Testing trade execution endpoint:")
     # Test the known working endpoint from documentation
@@ -102,10 +159,10 @@ def test_api_endpoints():
     }
     
     try:
-        response = requests.post(trade_url, json=payload, headers=headers, timeout=10)
+        response = session.post(trade_url, json=payload, headers=headers, timeout=10)
         print(f"   {trade_url} -> {response.status_code}")
         try:
-            data = response.json()
+            data = orjson.loads(response.content)
             print(f"      Response: {data}")
         except:
             print(f"      Response: {response.text}")
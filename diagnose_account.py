@@ -4,17 +4,58 @@ Comprehensive Recall Account and API Diagnostics
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import sys
-import json
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+
+# Shared session so all probes reuse keep-alive connections to the API host.
+# Transient gateway errors are retried with backoff; POSTs are not retried so
+# a test trade is never submitted twice.
+retry = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=["GET"],
+    respect_retry_after_header=True
+)
+session = requests.Session()
+session.mount("https://", HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=20))
+
+def auth_headers(api_key):
+    """Headers for an authenticated probe; public probes send none"""
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+
+def fetch_all(urls, headers=None):
+    """GET all URLs concurrently, returning responses (or exceptions) in input order"""
+    def fetch(url):
+        try:
+            return session.get(url, headers=headers, timeout=10)
+        except Exception as e:
+            return e
+    
+    with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        return list(executor.map(fetch, urls))
+
+# Characters allowed in a hex_hex API key
+API_KEY_CHARS = frozenset("0123456789abcdefABCDEF_")
 
 def check_api_key_format(api_key):
     """Check if API key follows expected format"""
+    key_length = len(api_key)
+    has_underscore = '_' in api_key
+    is_hex = has_underscore and API_KEY_CHARS.issuperset(api_key)
+    
     print("🔍 API Key Format Analysis:")
-    print(f"   Length: {len(api_key)}")
-    print(f"   Contains underscore: {'_' in api_key}")
-    print(f"   Format: {'hex_hex' if '_' in api_key and all(c in '0123456789abcdef_' for c in api_key.lower()) else 'unknown'}")
+    print(f"   Length: {key_length}")
+    print(f"   Contains underscore: {has_underscore}")
+    print(f"   Format: {'hex_hex' if is_hex else 'unknown'}")
     
-    if len(api_key) != 33 or '_' not in api_key:
+    if key_length != 33 or not has_underscore:
         print("   ⚠️  Warning: API key format may be incorrect")
         print("      Expected format: 16chars_16chars (33 total with underscore)")
     else:
@@ -31,11 +72,12 @@ def test_public_endpoints():
         "https://api.competitions.recall.network/sandbox/api/health"
     ]
     
-    for endpoint in public_endpoints:
+    for endpoint, response in zip(public_endpoints, fetch_all(public_endpoints)):
         try:
-            response = requests.get(endpoint, timeout=10)
+            if isinstance(response, Exception):
+                raise response
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 print(f"   ✅ {endpoint} -> OK")
                 print(f"      {data}")
             else:
@@ -56,15 +98,13 @@ def test_auth_with_different_urls(api_key):
     ]
     
     test_endpoint = "/account/portfolio"
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
+    urls = [f"{base_url}{test_endpoint}" for base_url in base_urls]
     
-    for base_url in base_urls:
+    # Probe all base URLs at once, then report in order and stop at the first success
+    for url, response in zip(urls, fetch_all(urls, headers=auth_headers(api_key))):
         try:
-            url = f"{base_url}{test_endpoint}"
-            response = requests.get(url, headers=headers, timeout=10)
+            if isinstance(response, Exception):
+                raise response
             
             print(f"   {url}")
             print(f"   Status: {response.status_code}")
@@ -72,14 +112,14 @@ def test_auth_with_different_urls(api_key):
             if response.status_code == 200:
                 print("   ✅ SUCCESS - API key is valid!")
                 try:
-                    data = response.json()
-                    print(f"   Data: {json.dumps(data, indent=6)}")
+                    data = orjson.loads(response.content)
+                    print(f"   Data: {orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()}")
                 except:
                     print(f"   Raw response: {response.text}")
                 return True
             elif response.status_code == 401:
                 try:
-                    error_data = response.json()
+                    error_data = orjson.loads(response.content)
                     print(f"   ❌ AUTH FAILED: {error_data.get('error', 'Unknown error')}")
                 except:
                     print(f"   ❌ AUTH FAILED: {response.text}")
@@ -88,7 +128,7 @@ def test_auth_with_different_urls(api_key):
             else:
                 print(f"   ❌ UNEXPECTED ERROR: {response.status_code}")
                 try:
-                    print(f"   Response: {response.json()}")
+                    print(f"   Response: {orjson.loads(response.content)}")
                 except:
                     print(f"   Raw: {response.text}")
             print()
@@ -104,10 +144,6 @@ def test_minimal_trade(api_key):
     print("💱 Testing Minimal Trade:")
     
     url = "https://api.competitions.recall.network/sandbox/api/trade/execute"
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
     
     # Try with minimal amount
     payload = {
@@ -118,12 +154,12 @@ def test_minimal_trade(api_key):
     }
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=30)
+        response = session.post(url, json=payload, headers=auth_headers(api_key), timeout=30)
         print(f"   Status: {response.status_code}")
         
         try:
-            data = response.json()
-            print(f"   Response: {json.dumps(data, indent=6)}")
+            data = orjson.loads(response.content)
+            print(f"   Response: {orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()}")
             
             if response.status_code == 200 and data.get('success'):
                 print("   ✅ Trade successful!")
@@ -6,30 +6,51 @@ A sophisticated trading agent for participating in Recall Network competitions.
 Features portfolio management, multiple trading strategies, and real-time monitoring.
 """
 
-import time
-import schedule
+import asyncio
 import signal
 import sys
 from typing import Optional
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from types import MappingProxyType
+
+import numpy as np
 
 from src.logger import setup_logger
-from src.config import Config
 from src.trading_client import RecallTradingClient
 from src.portfolio_manager import PortfolioManager
 from src.trading_strategy import MultiStrategyManager
 from src.market_data import PriceMonitor
+from src.rate_limiter import RateLimiter
 
 logger = setup_logger("RecallTradingAgent")
 
+# Upper bound on signal trades submitted to the API at the same time
+MAX_CONCURRENT_TRADES = 4
+
+# Trade submissions allowed per minute, shared by all trade workers
+TRADES_PER_MINUTE = 30
+
+# Token addresses used for strategy signal trades
+TRADE_TOKEN_ADDRESSES = MappingProxyType({
+    'WETH': '0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2',
+    'USDC': '0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48',
+    'SOL': 'So11111111111111111111111111111111111111112'
+})
+USDC_ADDRESS = TRADE_TOKEN_ADDRESSES['USDC']
+
 class TradingAgent:
     def __init__(self):
         self.trading_client = RecallTradingClient()
-        self.portfolio_manager = PortfolioManager()
-        self.strategy_manager = MultiStrategyManager()
-        self.price_monitor = PriceMonitor()
+        # Share one client so every component sees the same cached responses
+        self.portfolio_manager = PortfolioManager(trading_client=self.trading_client)
+        self.strategy_manager = MultiStrategyManager(self.trading_client)
+        self.price_monitor = PriceMonitor(trading_client=self.trading_client)
+        # Pace trades evenly; only as many as can be in flight may go back to back
+        self.trade_limiter = RateLimiter(TRADES_PER_MINUTE, 60, capacity=MAX_CONCURRENT_TRADES)
         self.running = False
+        self._stop = None
         
         # Get trading symbols from configuration
         from src.token_config import TokenConfigManager
@@ -43,6 +64,7 @@ class TradingAgent:
     def start(self):
         """Start the trading agent"""
         logger.info("Starting Recall Trading Agent...")
+        self.trading_client.prewarm()
         
         # Verify API connection
         if not self.trading_client.health_check():
@@ -64,17 +86,6 @@ class TradingAgent:
         # Initial portfolio status
         self.log_portfolio_status()
         
-        # Schedule periodic tasks
-        schedule.every(1).hours.do(self.rebalance_portfolio)
-        schedule.every(30).minutes.do(self.execute_trading_signals)
-        schedule.every(15).minutes.do(self.monitor_prices)
-        schedule.every(6).hours.do(self.log_portfolio_status)
-        schedule.every(24).hours.do(self.generate_daily_report)
-        
-        # Set up signal handlers for graceful shutdown
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
-        
         self.running = True
         logger.info("Trading Agent started successfully")
         
@@ -94,19 +105,7 @@ class TradingAgent:
             print("📝 Logs are saved to: logs/trading_agent_*.log")
             print("")
             
-            last_status_time = time.time()
-            status_interval = 300  # Show status every 5 minutes
-            
-            while self.running:
-                schedule.run_pending()
-                
-                # Show periodic status updates
-                current_time = time.time()
-                if current_time - last_status_time >= status_interval:
-                    self.show_live_status()
-                    last_status_time = current_time
-                
-                time.sleep(60)  # Check every minute
+            asyncio.run(self.run())
                 
         except KeyboardInterrupt:
             print("\n🛑 Received keyboard interrupt, shutting down...")
@@ -120,6 +119,40 @@ class TradingAgent:
         
         return True
     
+    async def run(self):
+        """Run all periodic jobs concurrently until the agent is stopped"""
+        loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        
+        # Set up signal handlers for graceful shutdown on the event loop itself
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, self._signal_handler, signum, None)
+        
+        await asyncio.gather(
+            self._every(3600, self.rebalance_portfolio),
+            self._every(1800, self.execute_trading_signals),
+            self._every(900, self.monitor_prices),
+            self._every(21600, self.log_portfolio_status),
+            self._every(86400, self.generate_daily_report),
+            self._every(300, self.show_live_status),  # Show status every 5 minutes
+        )
+    
+    async def _every(self, interval: float, job):
+        """Run a blocking job every `interval` seconds in a worker thread"""
+        loop = asyncio.get_running_loop()
+        next_run = loop.time() + interval
+        
+        while not self._stop.is_set():
+            # Wait until the job's deadline so run time doesn't push later runs back;
+            # a stop request wakes every job immediately
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=max(0.0, next_run - loop.time()))
+                break
+            except asyncio.TimeoutError:
+                pass
+            await asyncio.to_thread(job)
+            next_run = max(next_run + interval, loop.time())
+    
     def show_live_status(self):
         """Show live status update to the user"""
         try:
@@ -129,16 +162,19 @@ class TradingAgent:
             
             # Get portfolio status
             portfolio_status = self.portfolio_manager.get_portfolio_status()
-            total_value = sum(target.current_value for target in portfolio_status.values())
             
-            print(f"💰 Portfolio Value: ${total_value:,.0f}")
+            print(f"💰 Portfolio Value: ${portfolio_status.total_value:,.0f}")
+            
+            # Classify every symbol's drift in one pass
+            targets = list(portfolio_status.values())
+            drifts = np.abs(np.fromiter((t.drift for t in targets), dtype=np.float64, count=len(targets)))
+            indicators = np.where(drifts < 0.05, "⚖️", np.where(drifts < 0.15, "⚠️", "🔴"))
             
-            for symbol, target in portfolio_status.items():
-                drift_indicator = "⚖️" if abs(target.drift) < 0.05 else "⚠️" if abs(target.drift) < 0.15 else "🔴"
-                print(f"   {drift_indicator} {symbol}: {target.current_allocation*100:.1f}% (target: {target.target_allocation*100:.1f}%)")
+            for target, drift_indicator in zip(targets, indicators):
+                print(f"   {drift_indicator} {target.symbol}: {target.current_allocation:.1%} (target: {target.target_allocation:.1%})")
             
             # Check if rebalancing is needed
-            trades = self.portfolio_manager.calculate_rebalance_trades()
+            trades = self.portfolio_manager.calculate_rebalance_trades(portfolio_status)
             if trades:
                 print(f"🔄 Rebalancing needed: {len(trades)} trades")
             else:
@@ -157,6 +193,7 @@ class TradingAgent:
         
         # Final portfolio report
         self.log_portfolio_status()
+        self.portfolio_manager.close()
         print("✅ Trading Agent stopped successfully")
         logger.info("Trading Agent stopped")
     
@@ -164,6 +201,10 @@ class TradingAgent:
         """Handle shutdown signals"""
         logger.info(f"Received signal {signum}, shutting down gracefully...")
         self.running = False
+        
+        # Wake the scheduler instead of waiting for the next job interval
+        if self._stop is not None:
+            self._stop.set()
     
     def rebalance_portfolio(self):
         """Execute portfolio rebalancing"""
@@ -200,43 +241,51 @@ class TradingAgent:
             portfolio = self.trading_client.get_portfolio()
             available_capital = portfolio.get('total_value', 0)
             
-            executed_trades = 0
-            
-            for signal in signals:
+            # Size every signal in one pass, then execute the independent trades concurrently
+            position_sizes = self.strategy_manager.calculate_position_sizes(signals, available_capital)
+            trades = []
+            for signal, position_size in zip(signals, position_sizes.tolist()):
+                if position_size <= 0:
+                    continue
+                
                 try:
-                    if signal.action in ['buy', 'sell'] and signal.strength > 0.1:  # Only act on strong signals
-                        
-                        # Calculate position size
-                        position_size = self.strategy_manager.strategies[0].calculate_position_size(
-                            signal, available_capital
-                        )
-                        
-                        if position_size >= Config.MIN_TRADE_AMOUNT:
-                            # Get token addresses
-                            from_token, to_token = self._get_trade_tokens(signal)
-                            
-                            if from_token and to_token:
-                                result = self.trading_client.execute_trade(
-                                    from_token=from_token,
-                                    to_token=to_token,
-                                    amount=position_size,
-                                    reason=f"Strategy signal: {signal.reason}"
-                                )
-                                
-                                logger.info(f"Executed trade: {signal.action} {signal.symbol} - {signal.reason}")
-                                executed_trades += 1
-                                
-                                time.sleep(2)  # Rate limiting
+                    # Get token addresses
+                    from_token, to_token = self._get_trade_tokens(signal)
+                    
+                    if from_token and to_token:
+                        trades.append((signal, from_token, to_token, position_size))
                         
                 except Exception as e:
                     logger.error(f"Failed to execute signal for {signal.symbol}: {e}")
                     continue
             
+            with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_TRADES) as executor:
+                executed_trades = sum(executor.map(self._execute_signal_trade, trades))
+            
             logger.info(f"Executed {executed_trades} trades based on strategy signals")
             
         except Exception as e:
             logger.error(f"Error executing trading signals: {e}")
     
+    def _execute_signal_trade(self, trade) -> bool:
+        """Execute a single sized signal trade, returning whether it succeeded"""
+        signal, from_token, to_token, position_size = trade
+        try:
+            self.trade_limiter.acquire()
+            result = self.trading_client.execute_trade(
+                from_token=from_token,
+                to_token=to_token,
+                amount=position_size,
+                reason=f"Strategy signal: {signal.reason}"
+            )
+            
+            logger.info("Executed trade: %s %s - %s", signal.action, signal.symbol, signal.reason)
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to execute signal for {signal.symbol}: {e}")
+            return False
+    
     def monitor_prices(self):
         """Monitor price changes and generate alerts"""
         try:
@@ -249,8 +298,9 @@ class TradingAgent:
                     change_emoji = "📈" if alert['change'] > 0 else "📉"
                     print(f"   {change_emoji} {alert['symbol']}: {alert['change']:+.2%} "
                            f"(${alert['last_price']:.2f} → ${alert['current_price']:.2f})")
-                    logger.info(f"Price Alert: {alert['symbol']} changed {alert['change']:.2%} "
-                               f"from ${alert['last_price']:.4f} to ${alert['current_price']:.4f}")
+                    logger.info("Price Alert: %s changed %.2f%% from $%.4f to $%.4f",
+                                alert['symbol'], alert['change'] * 100,
+                                alert['last_price'], alert['current_price'])
             else:
                 print("📊 No significant price changes detected")
             
@@ -270,43 +320,23 @@ class TradingAgent:
     def generate_daily_report(self):
         """Generate comprehensive daily report"""
         try:
-            print(f"\n📋 {datetime.now().strftime('%H:%M:%S')} - Generating daily report...")
+            now = datetime.now()
+            print(f"\n📋 {now.strftime('%H:%M:%S')} - Generating daily report...")
             logger.info("Generating daily report...")
             
-            # Portfolio performance
-            performance = self.portfolio_manager.get_portfolio_performance()
-            
-            # Competition status
-            try:
-                competition_status = self.trading_client.get_competition_status()
-            except Exception as e:
-                logger.warning(f"Failed to get competition status, using mock data: {e}")
-                competition_status = {"status": "Demo Mode - API Key Invalid"}
-            
-            # Trade history - try new history endpoint first
-            try:
-                # Try the new account/history endpoint
-                account_history = self.trading_client.get_account_history()
-                if account_history:
-                    recent_trades = account_history[-10:]  # Last 10 entries
-                    logger.info("Using account/history endpoint for trade data")
-                else:
-                    raise Exception("No history data from new endpoint")
-            except Exception as history_error:
-                logger.debug(f"Account history endpoint failed: {history_error}")
-                try:
-                    # Fallback to trades endpoint
-                    recent_trades = self.trading_client.get_trade_history(limit=10)
-                except Exception as e:
-                    logger.warning(f"Failed to get trade history, using mock data: {e}")
-                    recent_trades = [
-                        {"timestamp": "2025-07-03T10:00:00Z", "from_token": "USDC", "to_token": "WETH", "amount": "100"},
-                        {"timestamp": "2025-07-03T11:30:00Z", "from_token": "WETH", "to_token": "SOL", "amount": "0.1"}
-                    ]
+            # Performance, competition status and trade history are independent - fetch them concurrently
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                performance_future = executor.submit(self.portfolio_manager.get_portfolio_performance)
+                competition_future = executor.submit(self._get_competition_status)
+                trades_future = executor.submit(self._get_recent_trades)
+                
+                performance = performance_future.result()
+                competition_status = competition_future.result()
+                recent_trades = trades_future.result()
             
             report = [
                 "=" * 60,
-                f"DAILY REPORT - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+                f"DAILY REPORT - {now.strftime('%Y-%m-%d %H:%M:%S')}",
                 "=" * 60,
                 "",
                 "PORTFOLIO PERFORMANCE:",
@@ -328,30 +358,55 @@ class TradingAgent:
             daily_report = "\n".join(report)
             logger.info(f"Daily Report:\n{daily_report}")
             
-            # Save to file
-            with open(f"logs/daily_report_{datetime.now().strftime('%Y%m%d')}.txt", "w") as f:
-                f.write(daily_report)
+            # Save to file. This runs in a worker thread under the scheduler, so the write
+            # never blocks the event loop; appending keeps earlier reports from the same day.
+            with open(f"logs/daily_report_{now.strftime('%Y%m%d')}.txt", "a", encoding="utf-8") as f:
+                f.write(daily_report + "\n")
             
         except Exception as e:
             logger.error(f"Error generating daily report: {e}")
     
+    def _get_competition_status(self) -> dict:
+        """Get competition status, falling back to demo data"""
+        try:
+            return self.trading_client.get_competition_status()
+        except Exception as e:
+            logger.warning(f"Failed to get competition status, using mock data: {e}")
+            return {"status": "Demo Mode - API Key Invalid"}
+    
+    def _get_recent_trades(self) -> list:
+        """Get recent trades - try new history endpoint first"""
+        try:
+            # Try the new account/history endpoint
+            account_history = self.trading_client.get_account_history()
+            if account_history:
+                logger.info("Using account/history endpoint for trade data")
+                return account_history[-10:]  # Last 10 entries
+            raise Exception("No history data from new endpoint")
+        except Exception as history_error:
+            logger.debug(f"Account history endpoint failed: {history_error}")
+            try:
+                # Fallback to trades endpoint
+                return self.trading_client.get_trade_history(limit=10)
+            except Exception as e:
+                logger.warning(f"Failed to get trade history, using mock data: {e}")
+                return [
+                    {"timestamp": "2025-07-03T10:00:00Z", "from_token": "USDC", "to_token": "WETH", "amount": "100"},
+                    {"timestamp": "2025-07-03T11:30:00Z", "from_token": "WETH", "to_token": "SOL", "amount": "0.1"}
+                ]
+    
     def _get_trade_tokens(self, signal) -> tuple:
         """Get token addresses for trading based on signal"""
         # This is a simplified implementation
         # In production, you'd have more sophisticated logic
-        
-        token_addresses = {
-            'WETH': '0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2',
-            'USDC': '0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48',
-            'SOL': 'So11111111111111111111111111111111111111112'
-        }
+        token = TRADE_TOKEN_ADDRESSES.get(signal.symbol)
         
         if signal.action == 'buy':
             # Buy signal: USDC -> target token
-            return token_addresses.get('USDC'), token_addresses.get(signal.symbol)
+            return USDC_ADDRESS, token
         elif signal.action == 'sell':
             # Sell signal: target token -> USDC
-            return token_addresses.get(signal.symbol), token_addresses.get('USDC')
+            return token, USDC_ADDRESS
         
         return None, None
 
@@ -367,21 +422,24 @@ def main():
     try:
         agent = TradingAgent()
         
-        if args.mode == 'status':
-            # Just show portfolio status and exit
-            agent.log_portfolio_status()
-            
-        elif args.mode == 'report':
-            # Generate report and exit
-            agent.generate_daily_report()
-            
-        else:
-            # Run the agent
-            if args.dry_run:
-                logger.info("Running in DRY-RUN mode - no actual trades will be executed")
-            
-            success = agent.start()
-            sys.exit(0 if success else 1)
+        try:
+            if args.mode == 'status':
+                # Just show portfolio status and exit
+                agent.log_portfolio_status()
+                
+            elif args.mode == 'report':
+                # Generate report and exit
+                agent.generate_daily_report()
+                
+            else:
+                # Run the agent
+                if args.dry_run:
+                    logger.info("Running in DRY-RUN mode - no actual trades will be executed")
+                
+                success = agent.start()
+                sys.exit(0 if success else 1)
+        finally:
+            agent.portfolio_manager.close()
             
     except KeyboardInterrupt:
         logger.info("Interrupted by user")
@@ -2,6 +2,7 @@ import os
 from dotenv import load_dotenv
 from typing import Dict, Any
 import json
+import orjson
 
 load_dotenv()
 
@@ -22,6 +23,12 @@ class Config:
     # Logging
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
     
+    # Local snapshot cache, kept at the project root unless overridden
+    SNAPSHOT_DB_PATH = os.getenv(
+        "SNAPSHOT_DB_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".recall_cache.db")
+    )
+    
     @classmethod
     def validate(cls) -> bool:
         if not cls.TRADING_SIM_API_KEY:
@@ -31,8 +38,8 @@ class Config:
     @classmethod
     def load_portfolio_config(cls, config_path: str = "config/portfolio_config.json") -> Dict[str, Any]:
         try:
-            with open(config_path, 'r') as f:
-                return json.load(f)
+            with open(config_path, 'rb') as f:
+                return orjson.loads(f.read())
         except FileNotFoundError:
             raise FileNotFoundError(f"Portfolio config file not found: {config_path}")
         except json.JSONDecodeError:
@@ -1,10 +1,24 @@
+import atexit
 import logging
+import queue
 import sys
 import os
-from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from datetime import date
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from src.config import Config
 
+# Default log file path, rebuilt only when the local date changes
+_log_date = None
+_log_path = None
+
+def _default_log_file() -> str:
+    global _log_date, _log_path
+    today = date.today()
+    if today != _log_date:
+        _log_date = today
+        _log_path = f"logs/trading_agent_{today.strftime('%Y%m%d')}.log"
+    return _log_path
+
 def setup_logger(name: str = "TradingAgent", log_file: str = None) -> logging.Logger:
     logger = logging.getLogger(name)
     
@@ -30,7 +44,7 @@ def setup_logger(name: str = "TradingAgent", log_file: str = None) -> logging.Lo
     
     # File handler
     if log_file is None:
-        log_file = f"logs/trading_agent_{datetime.now().strftime('%Y%m%d')}.log"
+        log_file = _default_log_file()
     
     # Ensure logs directory exists
     os.makedirs(os.path.dirname(log_file), exist_ok=True)
@@ -42,6 +56,12 @@ def setup_logger(name: str = "TradingAgent", log_file: str = None) -> logging.Lo
     )
     file_handler.setLevel(log_level)
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    
+    # Hand records to a background thread so callers never block on disk writes
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    logger.addHandler(QueueHandler(log_queue))
     
     return logger
\ No newline at end of file
@@ -1,14 +1,21 @@
 import requests
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 import logging
+import zlib
+import numpy as np
 from src.trading_client import RecallTradingClient
+from src.token_config import TokenConfigManager
 from src.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent price requests issued by PriceMonitor
+MAX_PRICE_WORKERS = 8
+
 @dataclass
 class PriceData:
     symbol: str
@@ -17,6 +24,21 @@ class PriceData:
     change_24h: Optional[float] = None
     volume_24h: Optional[float] = None
 
+@dataclass
+class PriceSeries:
+    """Price history for one symbol as parallel arrays in chronological order"""
+    symbol: str
+    prices: np.ndarray
+    timestamps: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.prices)
+    
+    def tail(self, count: int) -> 'PriceSeries':
+        """Most recent `count` points, as views onto the same arrays"""
+        start = max(len(self.prices) - count, 0)
+        return PriceSeries(self.symbol, self.prices[start:], self.timestamps[start:])
+
 @dataclass
 class MarketStats:
     symbol: str
@@ -28,9 +50,11 @@ class MarketStats:
     timestamp: float
 
 class MarketDataProvider:
-    def __init__(self):
-        self.trading_client = RecallTradingClient()
+    def __init__(self, trading_client: Optional[RecallTradingClient] = None):
+        self.trading_client = trading_client or RecallTradingClient()
+        self.token_config = TokenConfigManager()
         self.price_cache = {}
+        self.history_cache = {}
         self.cache_duration = 60  # 1 minute cache
         
     def get_token_price(self, token_address: str, chain: str) -> Optional[float]:
@@ -60,55 +84,97 @@ class MarketDataProvider:
     
     def get_multiple_prices(self, tokens: List[Dict[str, str]]) -> Dict[str, float]:
         prices = {}
+        missing = []
+        current_time = time.time()
         
+        # Serve what we can from the cache, then fetch the rest in one batch
         for token in tokens:
             symbol = token.get('symbol')
             address = token.get('address')
             chain = token.get('chain')
             
             if symbol and address and chain:
-                price = self.get_token_price(address, chain)
+                cached_data = self.price_cache.get(f"{address}_{chain}")
+                if cached_data and current_time - cached_data['timestamp'] < self.cache_duration:
+                    if cached_data['price'] is not None:
+                        prices[symbol] = cached_data['price']
+                else:
+                    missing.append(token)
+        
+        if missing:
+            try:
+                fetched = self.trading_client.get_token_prices_batch(missing)
+            except Exception as e:
+                logger.error(f"Failed to get prices for {len(missing)} tokens: {e}")
+                return prices
+            
+            for token in missing:
+                price = fetched.get(token['address'])
+                self.price_cache[f"{token['address']}_{token['chain']}"] = {
+                    'price': price,
+                    'timestamp': current_time
+                }
                 if price is not None:
-                    prices[symbol] = price
+                    prices[token['symbol']] = price
         
         return prices
     
     def get_price_history(self, symbol: str, hours: int = 24) -> List[PriceData]:
+        series = self.get_price_series(symbol, hours)
+        if series is None:
+            return []
+        
+        return [
+            PriceData(symbol=symbol, price=price, timestamp=timestamp)
+            for price, timestamp in zip(series.prices.tolist(), series.timestamps.tolist())
+        ]
+    
+    def get_price_series(self, symbol: str, hours: int = 24) -> Optional[PriceSeries]:
+        # Serve any window up to the longest recently built series for this symbol
+        cached_data = self.history_cache.get(symbol)
+        if cached_data and time.time() - cached_data['timestamp'] < self.cache_duration:
+            series = cached_data['series']
+            if len(series) >= hours:
+                return series.tail(hours)
+        
+        series = self._build_price_series(symbol, hours)
+        if series is not None:
+            self.history_cache[symbol] = {
+                'series': series,
+                'timestamp': time.time()
+            }
+        return series
+    
+    def _build_price_series(self, symbol: str, hours: int) -> Optional[PriceSeries]:
         # In a real implementation, you would fetch historical data
         # For now, we'll simulate with current price
         try:
             current_price = self.get_current_price_by_symbol(symbol)
             if current_price is None:
-                return []
-            
-            # Simulate historical data (in production, fetch real historical data)
-            price_history = []
-            current_time = time.time()
+                return None
             
-            for i in range(hours):
-                # Add some random variation for simulation
-                variation = 1 + (hash(f"{symbol}_{i}") % 100 - 50) / 1000  # ±5% variation
-                simulated_price = current_price * variation
-                
-                price_data = PriceData(
-                    symbol=symbol,
-                    price=simulated_price,
-                    timestamp=current_time - (i * 3600)  # i hours ago
-                )
-                price_history.append(price_data)
+            # Simulate historical data (in production, fetch real historical data).
+            # Index i is i hours ago; seeding from the symbol keeps each point stable
+            # across calls, so shorter windows are the tail of longer ones.
+            rng = np.random.default_rng(zlib.crc32(symbol.encode()))
+            variation = 1 + (rng.integers(0, 100, size=hours) - 50) / 1000  # ±5% variation
+            hours_ago = np.arange(hours, dtype=np.float64)
             
-            return list(reversed(price_history))  # Return in chronological order
+            # Return in chronological order
+            return PriceSeries(
+                symbol=symbol,
+                prices=(current_price * variation)[::-1],
+                timestamps=(time.time() - hours_ago * 3600)[::-1]
+            )
             
         except Exception as e:
             logger.error(f"Failed to get price history for {symbol}: {e}")
-            return []
+            return None
     
     def get_current_price_by_symbol(self, symbol: str) -> Optional[float]:
         try:
             # Use token configuration to get token info
-            from src.token_config import TokenConfigManager
-            token_config = TokenConfigManager()
-            token = token_config.get_token_by_symbol(symbol)
+            token = self.token_config.get_token_by_symbol(symbol)
             
             if not token:
                 logger.warning(f"Token {symbol} not found in configuration")
@@ -119,7 +185,7 @@ class MarketDataProvider:
                 logger.warning(f"Invalid price received for {symbol}: {price}")
                 return None
                 
-            logger.debug(f"Price for {symbol}: ${price:.6f}")
+            logger.debug("Price for %s: $%.6f", symbol, price)
             return price
             
         except Exception as e:
@@ -128,13 +194,13 @@ class MarketDataProvider:
     
     def calculate_price_change(self, symbol: str, hours: int = 24) -> Optional[float]:
         try:
-            price_history = self.get_price_history(symbol, hours + 1)
+            series = self.get_price_series(symbol, hours + 1)
             
-            if len(price_history) < 2:
+            if series is None or len(series) < 2:
                 return None
             
-            current_price = price_history[-1].price
-            past_price = price_history[0].price
+            current_price = float(series.prices[-1])
+            past_price = float(series.prices[0])
             
             if past_price > 0:
                 change = (current_price - past_price) / past_price
@@ -147,16 +213,15 @@ class MarketDataProvider:
     
     def get_market_summary(self) -> Dict[str, MarketStats]:
         # Get symbols from token configuration
-        from src.token_config import TokenConfigManager
-        token_config = TokenConfigManager()
-        symbols = token_config.get_token_symbols()
+        symbols = self.token_config.get_token_symbols()
         market_summary = {}
         
         for symbol in symbols:
             try:
                 current_price = self.get_current_price_by_symbol(symbol)
-                change_24h = self.calculate_price_change(symbol, 24)
+                # Build the 7-day series first so the 24h change is served from it
                 change_7d = self.calculate_price_change(symbol, 168)  # 7 days
+                change_24h = self.calculate_price_change(symbol, 24)
                 
                 if current_price is not None:
                     market_stats = MarketStats(
@@ -177,29 +242,27 @@ class MarketDataProvider:
     
     def get_volatility(self, symbol: str, hours: int = 24) -> Optional[float]:
         try:
-            price_history = self.get_price_history(symbol, hours)
+            series = self.get_price_series(symbol, hours)
             
-            if len(price_history) < 2:
+            if series is None or len(series) < 2:
                 return None
             
-            prices = [p.price for p in price_history]
-            
-            # Calculate returns
-            returns = []
-            for i in range(1, len(prices)):
-                if prices[i-1] > 0:
-                    return_val = (prices[i] - prices[i-1]) / prices[i-1]
-                    returns.append(return_val)
+            prices = series.prices
             
-            if not returns:
+            # Calculate returns, skipping steps that start from a non-positive price
+            previous = prices[:-1]
+            valid = previous > 0
+            if valid.all():
+                # Common case: one temporary, updated in place
+                returns = prices[1:] / previous
+                returns -= 1.0
+            elif valid.any():
+                returns = np.diff(prices)[valid] / previous[valid]
+            else:
                 return None
             
-            # Calculate standard deviation of returns (volatility)
-            mean_return = sum(returns) / len(returns)
-            variance = sum((r - mean_return) ** 2 for r in returns) / len(returns)
-            volatility = variance ** 0.5
-            
-            return volatility
+            # Standard deviation of returns (volatility)
+            return float(np.std(returns))
             
         except Exception as e:
             logger.error(f"Failed to calculate volatility for {symbol}: {e}")
@@ -212,28 +275,23 @@ class MarketDataProvider:
     
     def get_support_resistance_levels(self, symbol: str, hours: int = 168) -> Dict[str, float]:
         try:
-            price_history = self.get_price_history(symbol, hours)
+            series = self.get_price_series(symbol, hours)
             
-            if len(price_history) < 10:
+            if series is None or len(series) < 10:
                 return {}
             
-            prices = [p.price for p in price_history]
+            prices = series.prices
             
-            # Simple support and resistance calculation
-            max_price = max(prices)
-            min_price = min(prices)
-            avg_price = sum(prices) / len(prices)
-            
-            # Calculate support and resistance levels
-            resistance_1 = avg_price + (max_price - avg_price) * 0.618  # Fibonacci retracement
-            support_1 = avg_price - (avg_price - min_price) * 0.618
+            # Support and resistance at the Fibonacci levels (38.2% / 61.8%) of the
+            # observed price distribution, with the range taken from the same call
+            min_price, support_1, resistance_1, max_price = np.quantile(prices, [0.0, 0.382, 0.618, 1.0]).tolist()
             
             return {
                 'resistance': resistance_1,
                 'support': support_1,
                 'max_price': max_price,
                 'min_price': min_price,
-                'avg_price': avg_price
+                'avg_price': float(prices.mean())
             }
             
         except Exception as e:
@@ -241,50 +299,99 @@ class MarketDataProvider:
             return {}
 
 class PriceMonitor:
-    def __init__(self, price_change_threshold: float = 0.05):
-        self.market_data = MarketDataProvider()
+    def __init__(self, price_change_threshold: float = 0.05, trading_client: Optional[RecallTradingClient] = None):
+        self.market_data = MarketDataProvider(trading_client)
         self.price_change_threshold = price_change_threshold
-        self.last_prices = {}
+        # Last price of every symbol seen, including ones no longer monitored
+        self._known: Dict[str, float] = {}
+        # Last valid price per tracked symbol, NaN until one has been seen
+        self.symbols: List[str] = []
+        self._last = np.empty(0, dtype=np.float64)
+        self._change = np.empty(0, dtype=np.float64)
         self.alerts = []
+    
+    @property
+    def last_prices(self) -> Dict[str, float]:
+        """Last known price of every symbol seen so far, monitored now or not"""
+        self._remember()
+        return dict(self._known)
+    
+    @last_prices.setter
+    def last_prices(self, prices: Dict[str, Optional[float]]):
+        self._known = {symbol: price for symbol, price in prices.items() if price is not None}
+        self._set_tracked(self.symbols)
+    
+    def _remember(self):
+        """Copy the tracked symbols' valid prices into the persistent map"""
+        for symbol, price in zip(self.symbols, self._last.tolist()):
+            if price == price:
+                self._known[symbol] = price
+    
+    def _track(self, symbols: List[str]):
+        """Resize the last-price buffer to a new symbol list, keeping every known price"""
+        self._remember()
+        self._set_tracked(list(symbols))
+    
+    def _set_tracked(self, symbols: List[str]):
+        known = self._known
+        self.symbols = symbols
+        self._last = np.array([known.get(symbol, np.nan) for symbol in symbols], dtype=np.float64)
+        self._change = np.empty(len(symbols), dtype=np.float64)
+        
+    def fetch_prices(self, symbols: List[str]) -> Dict[str, Optional[float]]:
+        """Fetch current prices for all symbols concurrently"""
+        if not symbols:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(len(symbols), MAX_PRICE_WORKERS)) as executor:
+            prices = executor.map(self.market_data.get_current_price_by_symbol, symbols)
+            return dict(zip(symbols, prices))
+    
+    def monitor_prices(self, symbols: List[str], prices: Optional[Dict[str, Optional[float]]] = None) -> List[Dict[str, Any]]:
+        """Compare current prices against the last known ones and return change alerts
+        
+        Prices (symbol -> USD) are fetched unless the caller already has them;
+        symbols missing from them are treated as having no valid price.
+        """
+        if symbols != self.symbols:
+            self._track(symbols)
+        
+        if prices is None:
+            prices = self.fetch_prices(symbols)
+        current = np.fromiter(
+            (np.nan if prices.get(symbol) is None else prices[symbol] for symbol in symbols),
+            dtype=np.float64, count=len(symbols)
+        )
+        
+        # Compare every symbol at once; NaN or non-positive prices never alert
+        last = self._last
+        valid = current > 0
+        change = self._change
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.subtract(current, last, out=change)
+            np.divide(change, last, out=change)
+        triggered = valid & (last > 0) & (np.abs(change) >= self.price_change_threshold)
         
-    def monitor_prices(self, symbols: List[str]) -> List[Dict[str, Any]]:
         alerts = []
+        now = time.time()
+        for i in np.flatnonzero(triggered):
+            symbol = symbols[i]
+            alert = {
+                'symbol': symbol,
+                'type': 'price_change',
+                'current_price': float(current[i]),
+                'last_price': float(last[i]),
+                'change': float(change[i]),
+                'timestamp': now
+            }
+            alerts.append(alert)
+            logger.info("Price alert: %s changed %.2f%%", symbol, change[i] * 100)
         
-        for symbol in symbols:
-            try:
-                current_price = self.market_data.get_current_price_by_symbol(symbol)
-                
-                if current_price is None or current_price <= 0:
-                    logger.debug(f"Invalid price for {symbol}: {current_price}")
-                    continue
-                
-                if symbol in self.last_prices:
-                    last_price = self.last_prices[symbol]
-                    
-                    # Avoid division by zero
-                    if last_price is None or last_price <= 0:
-                        logger.debug(f"Invalid last price for {symbol}: {last_price}")
-                        self.last_prices[symbol] = current_price
-                        continue
-                    
-                    change = (current_price - last_price) / last_price
-                    
-                    if abs(change) >= self.price_change_threshold:
-                        alert = {
-                            'symbol': symbol,
-                            'type': 'price_change',
-                            'current_price': current_price,
-                            'last_price': last_price,
-                            'change': change,
-                            'timestamp': time.time()
-                        }
-                        alerts.append(alert)
-                        logger.info(f"Price alert: {symbol} changed {change:.2%}")
-                
-                self.last_prices[symbol] = current_price
-                
-            except Exception as e:
-                logger.error(f"Error monitoring price for {symbol}: {e}")
+        for i in np.flatnonzero(~valid):
+            logger.debug("Invalid price for %s: %s", symbols[i], prices.get(symbols[i]))
+        
+        # Only valid prices replace the last known ones
+        np.copyto(last, current, where=valid)
         
         return alerts
     
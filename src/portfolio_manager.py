@@ -1,14 +1,66 @@
-import json
+import os
+import sqlite3
+import threading
 import time
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
+import numpy as np
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 import logging
-from src.trading_client import RecallTradingClient, Balance, Token
+from src.trading_client import RecallTradingClient, BalanceArrays
 from src.config import Config
+from src.rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# How long a saved performance snapshot is served without refetching
+PERFORMANCE_CACHE_TTL = 300
+
+# Rebalance trades submitted per second, and at most in flight at once
+REBALANCE_TRADES_PER_SECOND = 1
+MAX_REBALANCE_WORKERS = 4
+
+# Portfolio endpoint chain names -> names used in the trading config
+_CHAIN_NAMES = {'evm': 'ethereum', 'svm': 'solana'}
+_token_fields = itemgetter('symbol', 'chain', 'value')
+
+# Rough USD prices used to value balances when the portfolio endpoint has no total
+_FALLBACK_PRICES = {
+    'USDC': 1.0,  # Stablecoins ~= $1
+    'USDbC': 1.0,
+    'SOL': 150.0,  # Rough SOL price estimate
+    'WETH': 3500.0,  # Rough ETH price estimate
+    'ETH': 3500.0
+}
+
+# Demonstration holdings used when the API can't be reached
+_MOCK_BALANCES = BalanceArrays(
+    addresses=np.array([
+        "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
+        "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2",
+        "So11111111111111111111111111111111111111112"
+    ], dtype=object),
+    symbols=np.array(["USDC", "WETH", "SOL"], dtype=object),
+    chains=np.array(["ethereum", "ethereum", "solana"], dtype=object),
+    amounts=np.array([1000.0, 0.5, 10.0]),
+    usd_values=np.array([1000.0, 2000.0, 500.0])
+)
+_MOCK_TOTAL_VALUE = float(_MOCK_BALANCES.usd_values.sum())
+
+# Report row formatters, parsed once
+_ALLOCATION_ROW = "{:<6}: Target {:.1%} | Current {:.1%} | Drift {:+.1%} | Value ${:,.2f}".format
+_TRADE_ROW = "Trade ${:,.2f}: {} -> {}".format
+
+@lru_cache(maxsize=8)
+def _read_config(config_path: str, mtime: float) -> bytes:
+    """Raw bytes of a portfolio config file; cached per (path, mtime) and shared between managers"""
+    with open(config_path, 'rb') as f:
+        return f.read()
+
+@dataclass(frozen=True, slots=True)
 class PortfolioTarget:
     symbol: str
     target_allocation: float
@@ -16,27 +68,71 @@ class PortfolioTarget:
     current_value: float
     drift: float
 
+@dataclass(frozen=True, slots=True)
+class PortfolioColumns:
+    """Portfolio targets as parallel columns (one entry per symbol) for vectorized math"""
+    symbols: List[str]
+    target_allocation: np.ndarray
+    current_value: np.ndarray
+    drift: np.ndarray
+
+class PortfolioStatus(dict):
+    """Mapping of symbol -> PortfolioTarget that also carries the total portfolio value"""
+    def __init__(self, total_value: float = 0.0):
+        super().__init__()
+        self.total_value = total_value
+    
+    def columns(self) -> PortfolioColumns:
+        """Current targets as parallel arrays, in mapping order"""
+        targets = list(self.values())
+        count = len(targets)
+        return PortfolioColumns(
+            symbols=list(self.keys()),
+            target_allocation=np.fromiter((t.target_allocation for t in targets), dtype=np.float64, count=count),
+            current_value=np.fromiter((t.current_value for t in targets), dtype=np.float64, count=count),
+            drift=np.fromiter((t.drift for t in targets), dtype=np.float64, count=count)
+        )
+
 class PortfolioManager:
-    def __init__(self, config_path: str = "config/portfolio_config.json"):
-        self.trading_client = RecallTradingClient()
+    def __init__(self, config_path: str = "config/portfolio_config.json",
+                 trading_client: Optional[RecallTradingClient] = None):
+        self.trading_client = trading_client or RecallTradingClient()
         self.config = self._load_config(config_path)
         self.target_allocations = self.config["target_allocations"]
         self.rebalance_threshold = self.config.get("rebalance_threshold", 0.05)
         self.min_trade_amount = self.config.get("min_trade_amount", 10)
         self.max_slippage = self.config.get("max_slippage", 0.01)
+        self.trade_limiter = RateLimiter(REBALANCE_TRADES_PER_SECOND)
+        # Local store for slow-moving API data, so a restarted agent starts warm.
+        # Opened on first use so managers that never save anything leave no file behind.
+        self._snapshot_path = Config.SNAPSHOT_DB_PATH
+        self._snapshot_db = None
+        self._snapshot_disabled = False
+        self._snapshot_lock = threading.Lock()
+        
+        # Symbol -> address / chain lookups; the first chain listing a symbol wins
+        self._symbol_to_address = {}
+        self._symbol_to_chain = {}
+        for chain, tokens in self.config.get("trading_pairs", {}).items():
+            for symbol, address in tokens.items():
+                self._symbol_to_address.setdefault(symbol, address)
+                self._symbol_to_chain.setdefault(symbol, chain)
+        self._configured_tokens = frozenset(self._symbol_to_chain)
+        self._configured_chains = frozenset(self.config.get("trading_pairs", {}))
         
     def _load_config(self, config_path: str) -> Dict:
         try:
-            with open(config_path, 'r') as f:
-                return json.load(f)
+            # Keyed on mtime so an edited file is re-read by the next manager. Only the
+            # immutable bytes are shared; each manager parses its own mutable copy.
+            return orjson.loads(_read_config(os.path.abspath(config_path), os.path.getmtime(config_path)))
         except FileNotFoundError:
             logger.error(f"Config file not found: {config_path}")
             raise
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Invalid JSON in config file: {e}")
             raise
     
-    def get_portfolio_status(self) -> Dict[str, PortfolioTarget]:
+    def get_portfolio_status(self) -> PortfolioStatus:
         try:
             # Use portfolio endpoint for most accurate data
             portfolio = self.trading_client.get_portfolio()
@@ -47,142 +143,132 @@ class PortfolioManager:
                 return self._process_portfolio_data(portfolio)
             
             # Fallback to balances endpoint (but calculate USD value)
-            balances = self.trading_client.get_balances()
+            balances = self.trading_client.get_balances_soa()
             total_value = self._calculate_portfolio_value_from_balances(balances)
             
         except Exception as e:
             logger.warning(f"Failed to get real portfolio data, using mock data: {e}")
             # Use mock data for demonstration when API fails
-            from src.trading_client import Balance, Token
-            balances = [
-                Balance(Token("0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48", "USDC", "ethereum", 6), 1000.0, 1000.0),
-                Balance(Token("0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2", "WETH", "ethereum", 18), 0.5, 2000.0),
-                Balance(Token("So11111111111111111111111111111111111111112", "SOL", "solana", 9), 10.0, 500.0)
-            ]
-            total_value = sum(balance.usd_value for balance in balances)
+            balances = _MOCK_BALANCES
+            total_value = _MOCK_TOTAL_VALUE
         
-        portfolio_status = {}
+        # First balance per symbol, matching a linear scan
+        values_by_symbol = {}
+        for symbol, usd_value in zip(balances.symbols, balances.usd_values.tolist()):
+            values_by_symbol.setdefault(symbol, usd_value)
         
-        for symbol, target_allocation in self.target_allocations.items():
-            current_balance = next((b for b in balances if b.token.symbol == symbol), None)
-            current_value = current_balance.usd_value if current_balance else 0.0
-            current_allocation = current_value / total_value if total_value > 0 else 0.0
-            drift = current_allocation - target_allocation
-            
-            portfolio_status[symbol] = PortfolioTarget(
-                symbol=symbol,
-                target_allocation=target_allocation,
-                current_allocation=current_allocation,
-                current_value=current_value,
-                drift=drift
-            )
-        
-        return portfolio_status
+        return self._build_portfolio_status(values_by_symbol, total_value)
     
-    def _process_portfolio_data(self, portfolio: Dict) -> Dict[str, PortfolioTarget]:
+    def _process_portfolio_data(self, portfolio: Dict) -> PortfolioStatus:
         """Process portfolio endpoint data - only include configured chains"""
         tokens = portfolio.get('tokens', [])
         
         # Only include tokens that are in our trading configuration
-        configured_tokens = set()
-        configured_chains = set()
-        for chain, token_map in self.config.get("trading_pairs", {}).items():
-            configured_chains.add(chain)
-            configured_tokens.update(token_map.keys())
+        configured_tokens = self._configured_tokens
+        configured_chains = self._configured_chains
         
         # Group tokens by symbol and sum their values (only for configured tokens/chains)
         token_values = {}
         total_value = 0
         
         for token in tokens:
-            symbol = token.get('symbol', 'UNKNOWN')
-            chain = token.get('chain', '')
-            value = token.get('value', 0)
+            try:
+                symbol, chain, value = _token_fields(token)
+            except KeyError:
+                # Rare: a token entry missing one of the fields
+                symbol = token.get('symbol', 'UNKNOWN')
+                chain = token.get('chain', '')
+                value = token.get('value', 0)
             
             # Map chain names: 'evm' -> 'ethereum', 'svm' -> 'solana'
-            mapped_chain = 'ethereum' if chain == 'evm' else 'solana' if chain == 'svm' else chain
+            mapped_chain = _CHAIN_NAMES.get(chain, chain)
             
             # Only include if symbol is configured and on a configured chain
             if symbol in configured_tokens and mapped_chain in configured_chains:
-                if symbol in token_values:
-                    token_values[symbol] += value
-                else:
-                    token_values[symbol] = value
+                token_values[symbol] = token_values.get(symbol, 0) + value
                 total_value += value
         
-        portfolio_status = {}
+        return self._build_portfolio_status(token_values, total_value)
+    
+    def _build_portfolio_status(self, values_by_symbol: Dict[str, float], total_value: float) -> PortfolioStatus:
+        """Build one PortfolioTarget per configured target from current USD values"""
+        inv_total = 1.0 / total_value if total_value > 0 else 0.0
+        portfolio_status = PortfolioStatus(total_value)
         for symbol, target_allocation in self.target_allocations.items():
-            current_value = token_values.get(symbol, 0.0)
-            current_allocation = current_value / total_value if total_value > 0 else 0.0
-            drift = current_allocation - target_allocation
+            current_value = values_by_symbol.get(symbol, 0.0)
+            current_allocation = current_value * inv_total
             
             portfolio_status[symbol] = PortfolioTarget(
                 symbol=symbol,
                 target_allocation=target_allocation,
                 current_allocation=current_allocation,
                 current_value=current_value,
-                drift=drift
+                drift=current_allocation - target_allocation
             )
         
         return portfolio_status
     
-    def _calculate_portfolio_value_from_balances(self, balances) -> float:
+    def _calculate_portfolio_value_from_balances(self, balances: BalanceArrays) -> float:
         """Calculate total portfolio value from balances (fallback method)"""
         # This is a simplified calculation - in reality we'd need price data
-        total_value = 0
-        for balance in balances:
-            if balance.token.symbol == 'USDC' or balance.token.symbol == 'USDbC':
-                total_value += balance.amount  # Stablecoins ~= $1
-            elif balance.token.symbol == 'SOL':
-                total_value += balance.amount * 150  # Rough SOL price estimate
-            elif balance.token.symbol == 'WETH' or balance.token.symbol == 'ETH':
-                total_value += balance.amount * 3500  # Rough ETH price estimate
-        return total_value
+        prices = np.fromiter(
+            (_FALLBACK_PRICES.get(symbol, 0.0) for symbol in balances.symbols),
+            dtype=np.float64, count=len(balances)
+        )
+        return float(balances.amounts @ prices)
     
     
-    def calculate_rebalance_trades(self) -> List[Tuple[str, str, float]]:
-        portfolio_status = self.get_portfolio_status()
-        total_portfolio_value = sum(target.current_value for target in portfolio_status.values())
+    def calculate_rebalance_trades(self, portfolio_status: Optional[PortfolioStatus] = None) -> List[Tuple[str, str, float]]:
+        # Callers that already hold a status snapshot pass it in to avoid rebuilding it
+        if portfolio_status is None:
+            portfolio_status = self.get_portfolio_status()
         
-        trades = []
+        columns = portfolio_status.columns()
+        symbols = columns.symbols
         
-        # Find tokens that need rebalancing
-        over_allocated = []
-        under_allocated = []
+        # Find tokens that need rebalancing, sized against the same total the drift was computed from
+        value_diff = columns.target_allocation * portfolio_status.total_value - columns.current_value
+        needs_rebalance = np.abs(columns.drift) > self.rebalance_threshold
+        under_allocated = np.flatnonzero(needs_rebalance & (value_diff > self.min_trade_amount))
+        over_allocated = np.flatnonzero(needs_rebalance & (value_diff < -self.min_trade_amount))
+        remaining = np.abs(value_diff).tolist()
         
-        for symbol, target in portfolio_status.items():
-            if abs(target.drift) > self.rebalance_threshold:
-                target_value = target.target_allocation * total_portfolio_value
-                value_diff = target_value - target.current_value
-                
-                if value_diff > self.min_trade_amount:
-                    under_allocated.append((symbol, value_diff))
-                elif value_diff < -self.min_trade_amount:
-                    over_allocated.append((symbol, abs(value_diff)))
+        # Group under-allocated tokens by chain; only same-chain trades are possible
+        under_by_chain = {}
+        for i in under_allocated.tolist():
+            under_by_chain.setdefault(self._get_token_chain(symbols[i]), []).append(i)
+        next_under = dict.fromkeys(under_by_chain, 0)
         
-        # Create trades to rebalance - prioritize same-chain trades
-        for over_symbol, over_amount in over_allocated:
-            for under_symbol, under_amount in under_allocated:
-                if over_amount > 0 and under_amount > 0:
-                    # Check if both tokens are on the same chain
-                    from_chain = self._get_token_chain(over_symbol)
-                    to_chain = self._get_token_chain(under_symbol)
-                    
-                    # Only create trade if on same chain
-                    if from_chain == to_chain:
-                        trade_amount = min(over_amount, under_amount)
-                        if trade_amount >= self.min_trade_amount:
-                            trades.append((over_symbol, under_symbol, trade_amount))
-                            
-                            # Update remaining amounts
-                            over_amount -= trade_amount
-                            under_amount -= trade_amount
+        # Greedily fill each chain's under-allocated tokens from its over-allocated ones,
+        # walking a single pointer per chain so every token is visited once
+        trades = []
+        for o in over_allocated.tolist():
+            chain = self._get_token_chain(symbols[o])
+            group = under_by_chain.get(chain, [])
+            while next_under.get(chain, 0) < len(group) and remaining[o] >= self.min_trade_amount:
+                u = group[next_under[chain]]
+                trade_amount = min(remaining[o], remaining[u])
+                if trade_amount >= self.min_trade_amount:
+                    trades.append((symbols[o], symbols[u], trade_amount))
+                    remaining[o] -= trade_amount
+                    remaining[u] -= trade_amount
+                if remaining[u] < self.min_trade_amount:
+                    next_under[chain] += 1
         
         return trades
     
+    def needs_rebalance(self, portfolio_status: PortfolioStatus) -> bool:
+        """Whether any target has drifted past the rebalance threshold"""
+        return any(abs(target.drift) > self.rebalance_threshold for target in portfolio_status.values())
+    
     def execute_rebalance(self) -> bool:
         try:
-            trades = self.calculate_rebalance_trades()
+            portfolio_status = self.get_portfolio_status()
+            if not self.needs_rebalance(portfolio_status):
+                logger.info("No rebalancing needed")
+                return True
+            
+            trades = self.calculate_rebalance_trades(portfolio_status)
             
             if not trades:
                 logger.info("No rebalancing needed")
@@ -190,51 +276,18 @@ class PortfolioManager:
             
             logger.info(f"Executing {len(trades)} rebalance trades")
             
-            for from_symbol, to_symbol, usd_amount in trades:
-                try:
-                    # Get token addresses and chains
-                    from_token = self._get_token_address(from_symbol)
-                    to_token = self._get_token_address(to_symbol)
-                    from_chain = self._get_token_chain(from_symbol)
-                    to_chain = self._get_token_chain(to_symbol)
-                    
-                    if not from_token or not to_token:
-                        logger.error(f"Token address not found for {from_symbol} or {to_symbol}")
-                        continue
-                    
-                    # Check if cross-chain trade (not supported yet)
-                    if from_chain != to_chain:
-                        logger.warning(f"Cross-chain trade not supported: {from_symbol} ({from_chain}) -> {to_symbol} ({to_chain})")
-                        continue
-                    
-                    # Get current price to calculate amount
-                    from_price = self.trading_client.get_token_price(from_token, from_chain)
-                    if from_price is None or from_price <= 0:
-                        logger.warning(f"Cannot get valid price for {from_symbol}, skipping trade")
-                        continue
-                    
-                    amount = usd_amount / from_price
-                    
-                    if amount >= self.min_trade_amount / from_price:
-                        logger.info(f"Attempting trade: {amount:.6f} {from_symbol} -> {to_symbol} on {from_chain}")
-                        logger.info(f"Trade details: USD ${usd_amount:.2f}, price ${from_price:.6f}")
-                        
-                        result = self.trading_client.execute_trade(
-                            from_token=from_token,
-                            to_token=to_token,
-                            amount=amount,
-                            reason=f"Portfolio rebalance: {from_symbol} -> {to_symbol} on {from_chain}"
-                        )
-                        
-                        logger.info(f"Rebalance trade executed: {amount:.6f} {from_symbol} -> {to_symbol} on {from_chain}")
-                        time.sleep(1)  # Avoid rate limiting
-                    else:
-                        logger.warning(f"Trade amount too small: {amount:.6f} {from_symbol} (min: {self.min_trade_amount / from_price:.6f})")
-                    
-                except Exception as e:
-                    logger.error(f"Failed to execute trade {from_symbol} -> {to_symbol}: {e}")
-                    logger.error(f"Trade parameters: from_token={from_token}, to_token={to_token}, amount={amount:.6f}")
-                    continue
+            # Price every token we sell from up front, concurrently
+            from_tokens = {}
+            for from_symbol, to_symbol, _ in trades:
+                address = self._get_token_address(from_symbol)
+                chain = self._get_token_chain(from_symbol)
+                if address and chain and chain == self._get_token_chain(to_symbol):
+                    from_tokens[address] = {'address': address, 'chain': chain}
+            prices = self.trading_client.get_token_prices_batch(list(from_tokens.values()))
+            
+            # Trades are independent API calls; overlap them, paced by the shared limiter
+            with ThreadPoolExecutor(max_workers=min(MAX_REBALANCE_WORKERS, len(trades))) as executor:
+                list(executor.map(lambda trade: self._execute_rebalance_trade(trade, prices), trades))
             
             return True
             
@@ -242,19 +295,129 @@ class PortfolioManager:
             logger.error(f"Portfolio rebalancing failed: {e}")
             return False
     
+    def _execute_rebalance_trade(self, trade: Tuple[str, str, float], prices: Dict[str, float]):
+        """Size and submit one rebalance trade using prefetched prices"""
+        from_symbol, to_symbol, usd_amount = trade
+        from_token = to_token = None
+        amount = 0.0
+        try:
+            # Get token addresses and chains
+            from_token = self._get_token_address(from_symbol)
+            to_token = self._get_token_address(to_symbol)
+            from_chain = self._get_token_chain(from_symbol)
+            to_chain = self._get_token_chain(to_symbol)
+            
+            if not from_token or not to_token:
+                logger.error(f"Token address not found for {from_symbol} or {to_symbol}")
+                return
+            
+            # Check if cross-chain trade (not supported yet)
+            if from_chain != to_chain:
+                logger.warning(f"Cross-chain trade not supported: {from_symbol} ({from_chain}) -> {to_symbol} ({to_chain})")
+                return
+            
+            # Current price to calculate amount
+            from_price = prices.get(from_token)
+            if from_price is None or from_price <= 0:
+                logger.warning(f"Cannot get valid price for {from_symbol}, skipping trade")
+                return
+            
+            amount = usd_amount / from_price
+            
+            if amount >= self.min_trade_amount / from_price:
+                logger.info(f"Attempting trade: {amount:.6f} {from_symbol} -> {to_symbol} on {from_chain}")
+                logger.info(f"Trade details: USD ${usd_amount:.2f}, price ${from_price:.6f}")
+                
+                self.trade_limiter.acquire()  # Avoid rate limiting
+                result = self.trading_client.execute_trade(
+                    from_token=from_token,
+                    to_token=to_token,
+                    amount=amount,
+                    reason=f"Portfolio rebalance: {from_symbol} -> {to_symbol} on {from_chain}"
+                )
+                
+                logger.info(f"Rebalance trade executed: {amount:.6f} {from_symbol} -> {to_symbol} on {from_chain}")
+            else:
+                logger.warning(f"Trade amount too small: {amount:.6f} {from_symbol} (min: {self.min_trade_amount / from_price:.6f})")
+            
+        except Exception as e:
+            logger.error(f"Failed to execute trade {from_symbol} -> {to_symbol}: {e}")
+            logger.error(f"Trade parameters: from_token={from_token}, to_token={to_token}, amount={amount:.6f}")
+    
     def _get_token_address(self, symbol: str) -> Optional[str]:
-        for chain, tokens in self.config.get("trading_pairs", {}).items():
-            if symbol in tokens:
-                return tokens[symbol]
-        return None
+        return self._symbol_to_address.get(symbol)
     
     def _get_token_chain(self, symbol: str) -> Optional[str]:
-        for chain, tokens in self.config.get("trading_pairs", {}).items():
-            if symbol in tokens:
-                return chain
-        return None
+        return self._symbol_to_chain.get(symbol)
+    
+    def _open_snapshot_db(self, path: str) -> Optional[sqlite3.Connection]:
+        try:
+            # Jobs run on worker threads; access is serialized by _snapshot_lock
+            db = sqlite3.connect(path, check_same_thread=False)
+            db.execute("CREATE TABLE IF NOT EXISTS snapshots (key TEXT PRIMARY KEY, value BLOB, ts REAL)")
+            return db
+        except sqlite3.Error as e:
+            logger.warning(f"Snapshot cache unavailable, continuing without it: {e}")
+            return None
+    
+    def _snapshot_connection(self, create: bool) -> Optional[sqlite3.Connection]:
+        """The snapshot database, opened on first use (hold _snapshot_lock)
+        
+        Reads never create the file; only the first write does.
+        """
+        if self._snapshot_db is None and not self._snapshot_disabled:
+            if not create and not os.path.exists(self._snapshot_path):
+                return None
+            self._snapshot_db = self._open_snapshot_db(self._snapshot_path)
+            self._snapshot_disabled = self._snapshot_db is None
+        return self._snapshot_db
+    
+    def _read_snapshot(self, key: str) -> Optional[Tuple[Dict, float]]:
+        """Return (value, saved_at) for key, or None"""
+        try:
+            with self._snapshot_lock:
+                db = self._snapshot_connection(create=False)
+                if db is None:
+                    return None
+                row = db.execute("SELECT value, ts FROM snapshots WHERE key = ?", (key,)).fetchone()
+            return (orjson.loads(row[0]), row[1]) if row else None
+        except (sqlite3.Error, orjson.JSONDecodeError) as e:
+            logger.debug(f"Failed to read snapshot {key}: {e}")
+            return None
+    
+    def _write_snapshot(self, key: str, value: Dict):
+        try:
+            with self._snapshot_lock:
+                db = self._snapshot_connection(create=True)
+                if db is None:
+                    return
+                with db:
+                    db.execute(
+                        "INSERT OR REPLACE INTO snapshots (key, value, ts) VALUES (?, ?, ?)",
+                        (key, orjson.dumps(value), time.time())
+                    )
+        except sqlite3.Error as e:
+            logger.debug(f"Failed to write snapshot {key}: {e}")
+    
+    def close(self):
+        """Close the snapshot database if it was opened"""
+        with self._snapshot_lock:
+            if self._snapshot_db is not None:
+                self._snapshot_db.close()
+                self._snapshot_db = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
     
     def get_portfolio_performance(self) -> Dict[str, float]:
+        # Served from the local store while fresh, including across restarts
+        snapshot = self._read_snapshot("performance")
+        if snapshot and time.time() - snapshot[1] < PERFORMANCE_CACHE_TTL:
+            return snapshot[0]
+        
         try:
             portfolio_data = self.trading_client.get_portfolio()
             
@@ -266,9 +429,14 @@ class PortfolioManager:
                 "daily_return_pct": portfolio_data.get("daily_return_pct", 0),
             }
             
+            self._write_snapshot("performance", performance)
             return performance
             
         except Exception as e:
+            if snapshot:
+                logger.warning(f"Failed to get portfolio performance, using last saved snapshot: {e}")
+                return snapshot[0]
+            
             logger.warning(f"Failed to get portfolio performance, using mock data: {e}")
             # Return mock performance data for demonstration
             return {
@@ -298,20 +466,22 @@ class PortfolioManager:
             report.append("CURRENT ALLOCATIONS:")
             report.append("-" * 30)
             
-            for symbol, target in portfolio_status.items():
-                report.append(f"{symbol:6}: Target {target.target_allocation:.1%} | "
-                             f"Current {target.current_allocation:.1%} | "
-                             f"Drift {target.drift:+.1%} | "
-                             f"Value ${target.current_value:,.2f}")
+            report.extend(
+                _ALLOCATION_ROW(symbol, target.target_allocation, target.current_allocation,
+                                target.drift, target.current_value)
+                for symbol, target in portfolio_status.items()
+            )
             
             # Rebalance recommendations
-            trades = self.calculate_rebalance_trades()
+            trades = self.calculate_rebalance_trades(portfolio_status)
             if trades:
                 report.append("")
                 report.append("REBALANCE RECOMMENDATIONS:")
                 report.append("-" * 30)
-                for from_symbol, to_symbol, amount in trades:
-                    report.append(f"Trade ${amount:,.2f}: {from_symbol} -> {to_symbol}")
+                report.extend(
+                    _TRADE_ROW(amount, from_symbol, to_symbol)
+                    for from_symbol, to_symbol, amount in trades
+                )
             else:
                 report.append("")
                 report.append("No rebalancing needed.")
@@ -0,0 +1,34 @@
+import threading
+import time
+from typing import Optional
+
+class RateLimiter:
+    """Thread-safe token bucket allowing `rate` acquisitions per `period` seconds
+
+    Up to `capacity` calls (default: `rate`) may go through back to back; after
+    that callers block until the bucket refills, so concurrent workers share one
+    request budget.
+    """
+
+    def __init__(self, rate: int, period: float = 1.0, capacity: Optional[int] = None):
+        self.capacity = float(rate if capacity is None else capacity)
+        self.fill_rate = rate / period
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.fill_rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.fill_rate
+
+            time.sleep(wait)
@@ -4,14 +4,17 @@ Token Configuration Manager
 Manages trading tokens configuration and provides utilities for token-based trading.
 """
 
-import json
 import logging
-from typing import Dict, List, Optional, Any
+import os
+import orjson
+from collections import Counter, defaultdict
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple, Any
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TokenInfo:
     symbol: str
     address: str
@@ -41,31 +44,46 @@ class TokenInfo:
         multipliers = risk_config.get('volatility_multipliers', {})
         return multipliers.get(self.volatility_expected, 1.0)
 
+@dataclass(frozen=True, slots=True)
+class TokenThresholds:
+    """A token's strategy parameters, resolved once from the strategy and risk config"""
+    momentum: float
+    z_score: float
+    position_size_ratio: float
+    volatility_multiplier: float
+
 class TokenConfigManager:
     def __init__(self, config_path: str = "config/trading_tokens.json"):
         self.config_path = config_path
         self.config = self._load_config()
         self.tokens = self._parse_tokens()
+        self._build_indexes()
     
     def _load_config(self) -> Dict:
         """Load token configuration from JSON file"""
         try:
-            with open(self.config_path, 'r') as f:
-                config = json.load(f)
+            with open(self.config_path, 'rb') as f:
+                # Remember which version of the file was parsed so polling can skip it
+                self._config_stamp = self._file_stamp(os.fstat(f.fileno()))
+                config = orjson.loads(f.read())
             logger.info(f"Loaded token configuration from {self.config_path}")
             return config
         except FileNotFoundError:
             logger.error(f"Token config file not found: {self.config_path}")
             raise
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Invalid JSON in token config file: {e}")
             raise
     
     def _parse_tokens(self) -> Dict[str, TokenInfo]:
         """Parse tokens from configuration"""
         tokens = {}
+        trading_tokens = self.config.get('trading_tokens', {})
+        
+        # How many chains list each symbol, counted once up front
+        self._symbol_counts = Counter(symbol for chain_tokens in trading_tokens.values() for symbol in chain_tokens)
         
-        for chain, chain_tokens in self.config.get('trading_tokens', {}).items():
+        for chain, chain_tokens in trading_tokens.items():
             for symbol, token_data in chain_tokens.items():
                 token_info = TokenInfo(
                     symbol=symbol,
@@ -83,29 +101,62 @@ class TokenConfigManager:
         
         return tokens
     
+    def _build_indexes(self):
+        """Precompute the filtered token views; rebuilt whenever tokens are re-parsed"""
+        self._enabled = tuple(token for token in self.tokens.values() if token.enabled)
+        self._by_chain = defaultdict(list)
+        self._by_category = defaultdict(list)
+        trading_pairs = {}
+        for token in self._enabled:
+            self._by_chain[token.chain].append(token)
+            self._by_category[token.category].append(token)
+            trading_pairs.setdefault(token.chain, {})[token.symbol] = token.address
+        self._trading_pairs = MappingProxyType(
+            {chain: MappingProxyType(pairs) for chain, pairs in trading_pairs.items()}
+        )
+        self._non_stable = tuple(token for token in self._enabled if token.category != 'stablecoin')
+        self._high_vol = [token for token in self._enabled if token.volatility_expected in ('high', 'very_high')]
+        self._symbols = [token.symbol for token in self._enabled]
+        # First token wins when two entries share a symbol or address, matching a linear scan
+        self._by_symbol = {}
+        self._by_address = {}
+        for token in self.tokens.values():
+            self._by_symbol.setdefault(token.symbol, token)
+            self._by_address.setdefault(token.address.lower(), token)
+        self._meme_symbols = frozenset(
+            symbol for symbol, token in self._by_symbol.items() if token.category == 'meme'
+        )
+        self._thresholds = {token: self._resolve_thresholds(token) for token in self.tokens.values()}
+        self._summary = None
+    
+    def _resolve_thresholds(self, token: TokenInfo) -> TokenThresholds:
+        strategy_config = self.get_strategy_config()
+        return TokenThresholds(
+            momentum=token.get_momentum_threshold(strategy_config),
+            z_score=token.get_z_score_threshold(strategy_config),
+            position_size_ratio=token.get_position_size_ratio(strategy_config),
+            volatility_multiplier=token.get_volatility_multiplier(self.get_risk_config())
+        )
+    
     def _has_duplicate_symbols(self, symbol: str) -> bool:
         """Check if symbol exists on multiple chains"""
-        count = 0
-        for chain_tokens in self.config.get('trading_tokens', {}).values():
-            if symbol in chain_tokens:
-                count += 1
-        return count > 1
+        return self._symbol_counts[symbol] > 1
     
     def get_all_tokens(self) -> List[TokenInfo]:
         """Get all configured tokens"""
         return list(self.tokens.values())
     
-    def get_enabled_tokens(self) -> List[TokenInfo]:
-        """Get only enabled tokens"""
-        return [token for token in self.tokens.values() if token.enabled]
+    def get_enabled_tokens(self) -> Tuple[TokenInfo, ...]:
+        """Get only enabled tokens as a shared, immutable snapshot (replaced on reload)"""
+        return self._enabled
     
     def get_tokens_by_chain(self, chain: str) -> List[TokenInfo]:
         """Get tokens for a specific chain"""
-        return [token for token in self.tokens.values() if token.chain == chain and token.enabled]
+        return list(self._by_chain.get(chain, ()))
     
     def get_tokens_by_category(self, category: str) -> List[TokenInfo]:
         """Get tokens by category (e.g., 'meme', 'defi', 'major')"""
-        return [token for token in self.tokens.values() if token.category == category and token.enabled]
+        return list(self._by_category.get(category, ()))
     
     def get_token_by_symbol(self, symbol: str, chain: Optional[str] = None) -> Optional[TokenInfo]:
         """Get token by symbol, optionally filtered by chain"""
@@ -114,17 +165,11 @@ class TokenConfigManager:
             return self.tokens.get(key)
         else:
             # Return first match if no chain specified
-            for token in self.tokens.values():
-                if token.symbol == symbol:
-                    return token
-            return None
+            return self._by_symbol.get(symbol)
     
     def get_token_by_address(self, address: str) -> Optional[TokenInfo]:
         """Get token by contract address"""
-        for token in self.tokens.values():
-            if token.address.lower() == address.lower():
-                return token
-        return None
+        return self._by_address.get(address.lower())
     
     def get_strategy_config(self) -> Dict:
         """Get strategy configuration"""
@@ -134,24 +179,30 @@ class TokenConfigManager:
         """Get risk management configuration"""
         return self.config.get('risk_management', {})
     
+    def get_token_thresholds(self, token: TokenInfo) -> TokenThresholds:
+        """Get a token's precomputed strategy thresholds"""
+        thresholds = self._thresholds.get(token)
+        return thresholds if thresholds is not None else self._resolve_thresholds(token)
+    
     def get_non_stablecoin_tokens(self) -> List[TokenInfo]:
         """Get all non-stablecoin tokens for trading signals"""
-        return [token for token in self.tokens.values() 
-                if token.enabled and token.category != 'stablecoin']
+        return list(self._non_stable)
+    
+    def get_tradeable_tokens(self) -> Tuple[TokenInfo, ...]:
+        """Get the non-stablecoin tokens as a shared, immutable snapshot (replaced on reload)"""
+        return self._non_stable
     
     def get_high_volatility_tokens(self) -> List[TokenInfo]:
         """Get tokens with high or very high expected volatility"""
-        return [token for token in self.tokens.values() 
-                if token.enabled and token.volatility_expected in ['high', 'very_high']]
+        return list(self._high_vol)
     
     def is_meme_token(self, symbol: str) -> bool:
         """Check if token is a meme token"""
-        token = self.get_token_by_symbol(symbol)
-        return token is not None and token.category == 'meme'
+        return symbol in self._meme_symbols
     
     def get_token_symbols(self) -> List[str]:
         """Get list of all enabled token symbols"""
-        return [token.symbol for token in self.get_enabled_tokens()]
+        return list(self._symbols)
     
     def validate_token_allocation(self, allocations: Dict[str, float]) -> bool:
         """Validate if token allocations comply with risk management rules"""
@@ -177,49 +228,57 @@ class TokenConfigManager:
         
         return True
     
-    def get_trading_pairs_config(self) -> Dict[str, Dict[str, str]]:
-        """Get trading pairs configuration for portfolio manager"""
-        trading_pairs = {}
-        
-        for token in self.get_enabled_tokens():
-            if token.chain not in trading_pairs:
-                trading_pairs[token.chain] = {}
-            trading_pairs[token.chain][token.symbol] = token.address
-        
-        return trading_pairs
+    def get_trading_pairs_config(self) -> Mapping[str, Mapping[str, str]]:
+        """Get trading pairs configuration for portfolio manager (read-only, shared between calls)"""
+        return self._trading_pairs
+    
+    @staticmethod
+    def _file_stamp(stat: os.stat_result) -> Tuple[int, int]:
+        return stat.st_mtime_ns, stat.st_size
     
     def reload_config(self):
         """Reload configuration from file"""
         self.config = self._load_config()
         self.tokens = self._parse_tokens()
+        self._build_indexes()
         logger.info("Token configuration reloaded")
     
+    def reload_if_changed(self) -> bool:
+        """Reload only if the file's mtime or size differs from the parsed version; returns whether it reloaded
+        
+        Meant for polling. A rewrite within the filesystem's timestamp resolution
+        that keeps the size can go unnoticed, so use reload_config() to force a reload.
+        """
+        if self._file_stamp(os.stat(self.config_path)) == self._config_stamp:
+            logger.debug("Token configuration unchanged, skipping reload")
+            return False
+        self.reload_config()
+        return True
+    
     def get_token_summary(self) -> str:
-        """Get a summary of configured tokens"""
-        enabled_tokens = self.get_enabled_tokens()
+        """Get a summary of configured tokens (built on first use after each config load)"""
+        if self._summary is None:
+            self._summary = self._build_summary()
+        return self._summary
+    
+    def _build_summary(self) -> str:
+        # chain -> category -> {symbol: None}, {volatility: None} (dicts as ordered sets)
+        groups = defaultdict(lambda: defaultdict(lambda: ({}, {})))
+        for token in self._enabled:
+            symbols, volatilities = groups[token.chain][token.category]
+            symbols[token.symbol] = None
+            volatilities[token.volatility_expected] = None
         
         summary = [
-            f"Total Tokens: {len(enabled_tokens)}",
-            f"Chains: {len(set(token.chain for token in enabled_tokens))}",
+            f"Total Tokens: {len(self._enabled)}",
+            f"Chains: {len(groups)}",
             ""
         ]
         
-        # Group by chain
-        for chain in set(token.chain for token in enabled_tokens):
-            chain_tokens = self.get_tokens_by_chain(chain)
-            summary.append(f"{chain.upper()} ({len(chain_tokens)} tokens):")
-            
-            # Group by category
-            categories = {}
-            for token in chain_tokens:
-                if token.category not in categories:
-                    categories[token.category] = []
-                categories[token.category].append(token.symbol)
-            
-            for category, symbols in categories.items():
-                volatility_info = {token.volatility_expected for token in chain_tokens if token.symbol in symbols}
-                summary.append(f"  {category}: {', '.join(symbols)} ({', '.join(volatility_info)} volatility)")
-            
+        for chain, categories in groups.items():
+            summary.append(f"{chain.upper()} ({len(self._by_chain[chain])} tokens):")
+            for category, (symbols, volatilities) in categories.items():
+                summary.append(f"  {category}: {', '.join(symbols)} ({', '.join(volatilities)} volatility)")
             summary.append("")
         
-        return "\n".join(summary)
\ No newline at end of file
+        return "\n".join(summary)
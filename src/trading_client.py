@@ -1,31 +1,123 @@
 import requests
-import json
+from requests.adapters import HTTPAdapter
+import atexit
+import orjson
+import threading
 import time
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from src.config import Config
 import logging
 import urllib3
+from urllib3.util.retry import Retry
 
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Seconds a fetched response may be reused before hitting the API again.
+# For one more TTL after that the stale value is still served while a
+# background refresh runs (stale-while-revalidate).
+PORTFOLIO_CACHE_TTL = 30
+COMPETITION_STATUS_CACHE_TTL = 300
+PRICE_CACHE_TTL = 15
+
+# Least recently used entries are evicted once the response cache grows past this
+MAX_CACHE_ENTRIES = 1024
+
+# Seconds a successful health check / API key validation is trusted before probing again
+HEALTH_CHECK_TTL = 10
+API_KEY_VALIDATION_TTL = 300
+
+# Upper bound on price requests in flight at once (stays under the session's pool size)
+MAX_PRICE_REQUESTS = 8
+
+# Chain name -> (chain, specificChain) query params for the price API; other chains pass through
+_CHAIN_PARAMS = {
+    "solana": ("svm", "svm"),
+    "ethereum": ("evm", "eth")
+}
+
+# (connect, read) timeout in seconds for requests that don't pass their own
+REQUEST_TIMEOUT = (3.0, 10.0)
+# Trades may fill server-side after a slow response, so wait much longer
+# before reporting one as failed
+TRADE_REQUEST_TIMEOUT = (3.0, 60.0)
+
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies REQUEST_TIMEOUT unless a call sets a timeout"""
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=REQUEST_TIMEOUT if timeout is None else timeout, **kwargs)
+
+# One keep-alive connection pool shared by every client instance, so the
+# market data, portfolio and strategy components don't each open their own
+# TLS connections to the API host
+_shared_session = requests.Session()
+# Transient gateway errors are retried with backoff. urllib3 only retries
+# idempotent methods by default, so trade POSTs are never replayed.
+_adapter = _TimeoutHTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=2 * MAX_PRICE_REQUESTS,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=(502, 503, 504), raise_on_status=False)
+)
+_shared_session.mount("https://", _adapter)
+_shared_session.mount("http://", _adapter)
+# Disable SSL verification to fix certificate issues
+_shared_session.verify = False
+atexit.register(_shared_session.close)
+
+# Set once prewarm() has started warming up the shared connection
+_prewarm_started = threading.Event()
+
+def _prewarm(url: str):
+    """Open the TLS connection to the API ahead of the first real request"""
+    try:
+        _shared_session.head(url, timeout=2)
+    except requests.RequestException as e:
+        logger.debug(f"Connection pre-warm failed: {e}")
+
+def _json(response: requests.Response) -> Any:
+    """Decode a response body like response.json(), raising requests' JSONDecodeError
+    
+    That error is a RequestException, so a non-JSON body (e.g. an HTML gateway
+    page) takes the same error path as a failed request.
+    """
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos, response=response) from e
+
+@dataclass(frozen=True, slots=True)
 class Token:
     address: str
     symbol: str
     chain: str
     decimals: int = 18
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Balance:
     token: Token
     amount: float
     usd_value: float
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class BalanceArrays:
+    """Balances as parallel columns (one entry per holding) for vectorized portfolio math"""
+    addresses: np.ndarray
+    symbols: np.ndarray
+    chains: np.ndarray
+    amounts: np.ndarray
+    usd_values: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+# Not frozen: status and tx_hash are filled in as the trade settles
+@dataclass(slots=True)
 class Trade:
     from_token: Token
     to_token: Token
@@ -38,13 +130,22 @@ class RecallTradingClient:
     def __init__(self):
         self.api_key = Config.TRADING_SIM_API_KEY
         self.base_url = Config.TRADING_SIM_API_URL
-        self.session = requests.Session()
+        self.session = _shared_session
         self.session.headers.update({
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         })
-        # Disable SSL verification to fix certificate issues
-        self.session.verify = False
+        
+        # Short-lived LRU response cache: key -> (fetched_at, value)
+        self._cache = OrderedDict()
+        self._refreshing = set()
+        # key -> number of times it was invalidated; a fetch that started before
+        # an invalidation must not store its (possibly outdated) result
+        self._invalidations = {}
+        self._cache_lock = threading.Lock()
+        # Monotonic time of the last successful probe (None until one succeeds)
+        self._healthy_at = None
+        self._validated_at = None
         
         # Common tokens
         self.tokens = {
@@ -57,12 +158,88 @@ class RecallTradingClient:
                 "SOL": Token("So11111111111111111111111111111111111111112", "SOL", "solana", 9)
             }
         }
+        # Lowercased address -> (chain, symbol, token); first listing wins
+        self._address_index = {}
+        for chain, tokens in self.tokens.items():
+            for symbol, token in tokens.items():
+                self._address_index.setdefault(token.address.lower(), (chain, symbol, token))
+    
+    def prewarm(self):
+        """Start opening the shared API connection in the background (once per process)"""
+        if not _prewarm_started.is_set():
+            _prewarm_started.set()
+            threading.Thread(target=_prewarm, args=(f"{self.base_url}/health",), daemon=True).start()
+    
+    def _cached(self, key: str, ttl: float, fetch, serve_stale: bool = True) -> Any:
+        """Return the cached value for key if younger than ttl seconds, otherwise fetch it
+        
+        With serve_stale, entries up to 2 * ttl old are returned immediately while
+        a background thread refreshes them. None results are never cached.
+        """
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            generation = self._invalidations.get(key, 0)
+            if entry is not None:
+                age = now - entry[0]
+                if age < ttl:
+                    self._cache.move_to_end(key)
+                    return entry[1]
+                if serve_stale and age < 2 * ttl:
+                    start_refresh = key not in self._refreshing
+                    self._refreshing.add(key)
+                    if start_refresh:
+                        threading.Thread(
+                            target=self._refresh, args=(key, entry, generation, fetch), daemon=True
+                        ).start()
+                    return entry[1]
+        
+        value = fetch()
+        if value is not None:
+            with self._cache_lock:
+                if self._invalidations.get(key, 0) == generation:
+                    self._store(key, (now, value))
+        return value
+    
+    def _store(self, key: str, entry):
+        """Insert entry as most recently used, evicting the oldest beyond MAX_CACHE_ENTRIES (hold _cache_lock)"""
+        self._cache[key] = entry
+        self._cache.move_to_end(key)
+        if len(self._cache) > MAX_CACHE_ENTRIES:
+            self._cache.popitem(last=False)
+    
+    def _invalidate(self, key: str):
+        """Drop key and discard any fetch of it already in flight (hold _cache_lock)"""
+        self._cache.pop(key, None)
+        self._invalidations[key] = self._invalidations.get(key, 0) + 1
+    
+    def _refresh(self, key: str, stale_entry, generation: int, fetch):
+        """Background half of _cached: replace a stale entry unless it changed meanwhile"""
+        try:
+            value = fetch()
+            fetched_at = time.monotonic()
+            # Only replace the entry we set out to refresh, and only if it wasn't
+            # invalidated (e.g. by a trade) while this response was in flight
+            with self._cache_lock:
+                if (value is not None and self._cache.get(key) is stale_entry
+                        and self._invalidations.get(key, 0) == generation):
+                    self._store(key, (fetched_at, value))
+        except Exception as e:
+            logger.debug(f"Background refresh of {key} failed: {e}")
+        finally:
+            with self._cache_lock:
+                self._refreshing.discard(key)
     
     def get_portfolio(self) -> Dict[str, Any]:
+        """Get the agent portfolio, reusing a snapshot fetched within PORTFOLIO_CACHE_TTL"""
+        # Never served stale: trade and rebalance sizing read holdings from it
+        return self._cached("portfolio", PORTFOLIO_CACHE_TTL, self._fetch_portfolio, serve_stale=False)
+    
+    def _fetch_portfolio(self) -> Dict[str, Any]:
         try:
             response = self.session.get(f"{self.base_url}/agent/portfolio")
             response.raise_for_status()
-            return response.json()
+            return _json(response)
         except requests.RequestException as e:
             logger.error(f"Failed to get portfolio: {e}")
             raise
@@ -73,52 +250,64 @@ class RecallTradingClient:
         try:
             response = self.session.get(f"{self.base_url}/agent/history")
             response.raise_for_status()
-            return response.json().get("history", [])
+            return _json(response).get("history", [])
         except requests.RequestException as e:
             logger.error(f"Failed to get account history: {e}")
             raise
 
     def get_balances(self) -> List[Balance]:
+        balances = self.get_balances_soa()
+        return [
+            # Default decimals, as not provided in response
+            Balance(Token(address, symbol, chain, 18), amount, usd_value)
+            for address, symbol, chain, amount, usd_value in zip(
+                balances.addresses, balances.symbols, balances.chains,
+                balances.amounts.tolist(), balances.usd_values.tolist()
+            )
+        ]
+    
+    def get_balances_soa(self) -> BalanceArrays:
+        """Get agent balances as parallel arrays instead of one object per holding"""
         try:
             response = self.session.get(f"{self.base_url}/agent/balances")
             response.raise_for_status()
-            data = response.json()
-            
-            balances = []
-            for balance_data in data.get("balances", []):
-                # New agent/balances endpoint has flat structure
-                token = Token(
-                    address=balance_data.get("tokenAddress"),
-                    symbol=balance_data.get("symbol"),
-                    chain=balance_data.get("chain"),
-                    decimals=18  # Default, as not provided in response
-                )
-                
-                balance = Balance(
-                    token=token,
-                    amount=float(balance_data.get("amount", 0)),
-                    usd_value=float(balance_data.get("usd_value", 0))
-                )
-                balances.append(balance)
+            rows = _json(response).get("balances", [])
             
-            return balances
+            # New agent/balances endpoint has flat structure
+            count = len(rows)
+            return BalanceArrays(
+                addresses=np.array([row.get("tokenAddress") for row in rows], dtype=object),
+                symbols=np.array([row.get("symbol") for row in rows], dtype=object),
+                chains=np.array([row.get("chain") for row in rows], dtype=object),
+                amounts=np.fromiter((float(row.get("amount", 0)) for row in rows), dtype=np.float64, count=count),
+                usd_values=np.fromiter((float(row.get("usd_value", 0)) for row in rows), dtype=np.float64, count=count)
+            )
         except requests.RequestException as e:
             logger.error(f"Failed to get balances: {e}")
             raise
     
     def get_token_price(self, token_address: str, chain: str) -> float:
+        """Get a token's USD price, reusing a quote fetched within PRICE_CACHE_TTL"""
+        return self._cached(
+            f"price:{chain}:{token_address}", PRICE_CACHE_TTL,
+            lambda: self._fetch_token_price(token_address, chain)
+        )
+    
+    def invalidate_price(self, token_address: str, chain: str):
+        """Drop the cached quote for one token so the next lookup hits the API"""
+        with self._cache_lock:
+            self._invalidate(f"price:{chain}:{token_address}")
+    
+    def clear_price_cache(self):
+        """Drop every cached token quote"""
+        with self._cache_lock:
+            for key in [key for key in (*self._cache, *self._refreshing) if key.startswith("price:")]:
+                self._invalidate(key)
+    
+    def _fetch_token_price(self, token_address: str, chain: str) -> float:
         try:
             # Map chain names to the correct format for the API
-            if chain == "solana":
-                chain_param = "svm"
-                specific_chain = "svm"
-            elif chain == "ethereum":
-                chain_param = "evm"
-                specific_chain = "eth"
-            else:
-                # Default mapping
-                chain_param = chain
-                specific_chain = chain
+            chain_param, specific_chain = _CHAIN_PARAMS.get(chain, (chain, chain))
             
             params = {
                 "token": token_address,
@@ -126,10 +315,10 @@ class RecallTradingClient:
                 "specificChain": specific_chain
             }
             
-            logger.debug(f"Fetching price for {token_address[:10]}... on {chain}")
+            logger.debug("Fetching price for %s... on %s", token_address[:10], chain)
             response = self.session.get(f"{self.base_url}/price", params=params)
             response.raise_for_status()
-            data = response.json()
+            data = _json(response)
             
             price = float(data.get("price", 0))
             if price <= 0:
@@ -137,7 +326,7 @@ class RecallTradingClient:
                 # Return None instead of 0 to indicate failure
                 return None
             
-            logger.debug(f"Price fetched: ${price:.6f} for {token_address[:10]}...")
+            logger.debug("Price fetched: $%.6f for %s...", price, token_address[:10])
             return price
             
         except requests.RequestException as e:
@@ -145,6 +334,23 @@ class RecallTradingClient:
             # Return None instead of 0 to properly handle failures
             return None
     
+    def get_token_prices_batch(self, tokens: List[Dict[str, str]]) -> Dict[str, float]:
+        """Fetch prices for many tokens at once, keyed by token address
+        
+        The API only prices one token per request, so the requests are issued
+        concurrently over the shared connection pool. Tokens without a valid price are omitted.
+        """
+        if not tokens:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(MAX_PRICE_REQUESTS, len(tokens))) as executor:
+            prices = executor.map(lambda token: self.get_token_price(token['address'], token['chain']), tokens)
+            return {
+                token['address']: price
+                for token, price in zip(tokens, prices)
+                if price is not None
+            }
+    
     def get_trade_quote(self, from_token: str, to_token: str, amount: float, chain: str) -> Dict[str, Any]:
         try:
             payload = {
@@ -153,9 +359,9 @@ class RecallTradingClient:
                 "amount": str(amount),
                 "chain": chain
             }
-            response = self.session.post(f"{self.base_url}/trade/quote", json=payload)
+            response = self.session.post(f"{self.base_url}/trade/quote", data=orjson.dumps(payload))
             response.raise_for_status()
-            return response.json()
+            return _json(response)
         except requests.RequestException as e:
             logger.error(f"Failed to get trade quote: {e}")
             raise
@@ -169,24 +375,37 @@ class RecallTradingClient:
                 "reason": reason
             }
             
-            # Log the request details for debugging
-            logger.info(f"Executing trade request:")
-            logger.info(f"  URL: {self.base_url}/trade/execute")
-            logger.info(f"  Payload: {payload}")
-            logger.info(f"  Headers: {dict(self.session.headers)}")
+            # Log the request details for debugging; headers are only copied
+            # (with the bearer token masked) when a debug sink will emit them
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Executing trade request:")
+                logger.debug("  URL: %s/trade/execute", self.base_url)
+                logger.debug("  Payload: %s", payload)
+                headers = dict(self.session.headers)
+                if "Authorization" in headers:
+                    headers["Authorization"] = "Bearer ***"
+                logger.debug("  Headers: %s", headers)
             
-            response = self.session.post(f"{self.base_url}/trade/execute", json=payload)
+            response = self.session.post(
+                f"{self.base_url}/trade/execute", data=orjson.dumps(payload), timeout=TRADE_REQUEST_TIMEOUT
+            )
             
             # Log response details for debugging
-            logger.info(f"Trade response status: {response.status_code}")
+            logger.info("Trade response status: %s", response.status_code)
+            response_data = None
             try:
-                response_data = response.json()
-                logger.info(f"Trade response data: {response_data}")
+                response_data = orjson.loads(response.content)
+                logger.debug("Trade response data: %s", response_data)
             except:
-                logger.info(f"Trade response text: {response.text}")
+                logger.info("Trade response text: %s", response.text)
             
             response.raise_for_status()
-            result = response.json()
+            # Parse once; an unparseable success body still raises here as before
+            result = response_data if response_data is not None else _json(response)
+            
+            # Holdings changed, so the cached portfolio is stale
+            with self._cache_lock:
+                self._invalidate("portfolio")
             
             logger.info(f"Trade executed successfully: {amount} {from_token} -> {to_token}")
             return result
@@ -200,7 +419,7 @@ class RecallTradingClient:
             logger.error(f"  PAYLOAD: {payload}")
             if hasattr(e, 'response') and e.response is not None:
                 try:
-                    error_data = e.response.json()
+                    error_data = orjson.loads(e.response.content)
                     logger.error(f"API error response: {error_data}")
                 except:
                     logger.error(f"API error text: {e.response.text}")
@@ -209,15 +428,15 @@ class RecallTradingClient:
     def get_token_info(self, token_address: str) -> Dict[str, Any]:
         """Get token information including chain and symbol"""
         # Check if token is in our known tokens
-        for chain, tokens in self.tokens.items():
-            for symbol, token in tokens.items():
-                if token.address.lower() == token_address.lower():
-                    return {
-                        "symbol": symbol,
-                        "chain": chain,
-                        "address": token_address,
-                        "decimals": token.decimals
-                    }
+        known = self._address_index.get(token_address.lower())
+        if known is not None:
+            chain, symbol, token = known
+            return {
+                "symbol": symbol,
+                "chain": chain,
+                "address": token_address,
+                "decimals": token.decimals
+            }
         
         # If not found, try to determine from address format
         if token_address.startswith("0x"):
@@ -240,16 +459,20 @@ class RecallTradingClient:
             params = {"limit": limit}
             response = self.session.get(f"{self.base_url}/agent/trades", params=params)
             response.raise_for_status()
-            return response.json().get("trades", [])
+            return _json(response).get("trades", [])
         except requests.RequestException as e:
             logger.error(f"Failed to get trade history: {e}")
             raise
     
     def get_competition_status(self) -> Dict[str, Any]:
+        """Get the competition status, reusing a response fetched within COMPETITION_STATUS_CACHE_TTL"""
+        return self._cached("competition_status", COMPETITION_STATUS_CACHE_TTL, self._fetch_competition_status)
+    
+    def _fetch_competition_status(self) -> Dict[str, Any]:
         try:
             response = self.session.get(f"{self.base_url}/competition/status")
             response.raise_for_status()
-            return response.json()
+            return _json(response)
         except requests.RequestException as e:
             logger.error(f"Failed to get competition status: {e}")
             raise
@@ -258,20 +481,31 @@ class RecallTradingClient:
         try:
             response = self.session.get(f"{self.base_url}/competition/leaderboard")
             response.raise_for_status()
-            return response.json()
+            return _json(response)
         except requests.RequestException as e:
             logger.error(f"Failed to get leaderboard: {e}")
             raise
     
     def health_check(self) -> bool:
+        if self._healthy_at is not None and time.monotonic() - self._healthy_at < HEALTH_CHECK_TTL:
+            return True
         try:
             response = self.session.get(f"{self.base_url}/health")
-            return response.status_code == 200
+            healthy = response.status_code == 200
         except requests.RequestException:
             return False
+        if healthy:
+            self._healthy_at = time.monotonic()
+        return healthy
     
     def validate_api_key(self) -> bool:
-        """Validate if the API key is working by testing multiple endpoints"""
+        """Validate if the API key is working by testing multiple endpoints
+        
+        A successful validation is trusted for API_KEY_VALIDATION_TTL seconds.
+        """
+        if self._validated_at is not None and time.monotonic() - self._validated_at < API_KEY_VALIDATION_TTL:
+            return True
+        
         test_endpoints = [
             "/agent/portfolio",
             "/agent/balances", 
@@ -283,7 +517,7 @@ class RecallTradingClient:
                 response = self.session.get(f"{self.base_url}{endpoint}")
                 if response.status_code == 401:
                     try:
-                        error_data = response.json()
+                        error_data = orjson.loads(response.content)
                         logger.error(f"API Key validation failed on {endpoint}: {error_data.get('error', 'Unknown error')}")
                     except:
                         logger.error(f"API Key validation failed on {endpoint}: 401 Unauthorized")
@@ -291,6 +525,7 @@ class RecallTradingClient:
                 elif response.status_code in [200, 404]:
                     # Found a working endpoint
                     logger.debug(f"API Key validation successful on {endpoint}")
+                    self._validated_at = time.monotonic()
                     return True
             except requests.RequestException as e:
                 logger.debug(f"Endpoint {endpoint} test failed: {e}")
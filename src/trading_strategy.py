@@ -1,16 +1,139 @@
+import math
 import time
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 import logging
 from src.trading_client import RecallTradingClient
 from src.config import Config
-from src.token_config import TokenConfigManager
+from src.token_config import TokenConfigManager, TokenInfo
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Expected gap between signal passes in seconds; sizes the initial price
+# history, which grows if samples arrive faster than this
+PRICE_SAMPLE_INTERVAL = 60
+
+# Variance below this fraction of mean² is treated as a flat price history
+_MIN_RELATIVE_VARIANCE = 1e-12
+
+def _price_array(tokens, prices: Dict[str, float]) -> np.ndarray:
+    """Each token's price from an address -> price dict, NaN where missing or not positive"""
+    values = np.fromiter(
+        (prices.get(token.address) or np.nan for token in tokens),
+        dtype=np.float64, count=len(tokens)
+    )
+    values[~(values > 0)] = np.nan
+    return values
+
+class SharedPriceStore:
+    """Price histories for every token in one (tokens x ticks) matrix, shared by all strategies
+    
+    Each record() call writes one column holding every token's price at a shared
+    timestamp, NaN where a token had no valid price. The columns form a ring
+    buffer: a tick is recorded once and the oldest tick is overwritten in place,
+    unless it is still inside the lookback window, in which case the buffer grows.
+    """
+    
+    def __init__(self, lookback_hours: float = 0):
+        self.lookback_hours = lookback_hours
+        self._row_of: Dict[Tuple[str, str], int] = {}
+        self._rows_cache = (None, None)  # (token tuple, its rows) from the last rows() call
+        # Allocated on first use, once every strategy has declared its lookback
+        self._matrix = None
+        self._timestamps = None
+        self.head = 0  # Next column to write
+        self.count = 0
+    
+    def ensure_lookback(self, lookback_hours: float):
+        """Retain at least lookback_hours of history"""
+        self.lookback_hours = max(self.lookback_hours, lookback_hours)
+    
+    def rows(self, tokens) -> np.ndarray:
+        """Matrix row of each token, adding empty rows for tokens seen for the first time"""
+        cached_tokens, cached_rows = self._rows_cache
+        if tokens is cached_tokens:
+            return cached_rows
+        
+        for token in tokens:
+            self._row_of.setdefault((token.symbol, token.chain), len(self._row_of))
+        self._reserve(len(self._row_of))
+        rows = np.fromiter(
+            (self._row_of[(token.symbol, token.chain)] for token in tokens),
+            dtype=np.intp, count=len(tokens)
+        )
+        self._rows_cache = (tokens, rows)
+        return rows
+    
+    def _reserve(self, row_count: int):
+        if self._matrix is None:
+            capacity = max(1, math.ceil(self.lookback_hours * 3600 / PRICE_SAMPLE_INTERVAL))
+            self._matrix = np.full((row_count, capacity), np.nan)
+            self._timestamps = np.empty(capacity, dtype=np.float64)
+        elif row_count > len(self._matrix):
+            grown = np.full((row_count, self._matrix.shape[1]), np.nan)
+            grown[:len(self._matrix)] = self._matrix
+            self._matrix = grown
+    
+    def _grow(self):
+        """Double the tick capacity of a full buffer, unrolling it so the oldest tick is column 0"""
+        capacity = self._matrix.shape[1]
+        order = np.roll(np.arange(capacity), -self.head)
+        matrix = np.full((len(self._matrix), 2 * capacity), np.nan)
+        matrix[:, :capacity] = self._matrix[:, order]
+        timestamps = np.empty(2 * capacity, dtype=np.float64)
+        timestamps[:capacity] = self._timestamps[order]
+        self._matrix = matrix
+        self._timestamps = timestamps
+        self.head = capacity
+    
+    def record(self, tokens, prices: Dict[str, float], timestamp: float):
+        """Append one tick of prices (keyed by address); missing or invalid prices are stored as NaN"""
+        rows = self.rows(tokens)
+        # Overwriting a tick still inside the lookback window would silently
+        # shorten every strategy's history, so make room instead
+        if (self.count == self._matrix.shape[1]
+                and self._timestamps[self.head] > timestamp - self.lookback_hours * 3600):
+            self._grow()
+        column = self._matrix[:, self.head]
+        column.fill(np.nan)
+        column[rows] = _price_array(tokens, prices)
+        self._timestamps[self.head] = timestamp
+        
+        capacity = self._matrix.shape[1]
+        self.head = (self.head + 1) % capacity
+        if self.count < capacity:
+            self.count += 1
+    
+    def _live(self, cutoff: float) -> Tuple[int, int]:
+        """(physical start column, length) of the ticks newer than cutoff"""
+        # Ticks are recorded in time order, so the expired ones are the oldest
+        # and can be found by binary search: oldest-first is [head:] then [:head]
+        # once the buffer has wrapped, or just [:count] before that
+        capacity = len(self._timestamps)
+        if self.count < capacity:
+            expired = np.searchsorted(self._timestamps[:self.count], cutoff, side='right')
+        else:
+            older = self._timestamps[self.head:]
+            expired = np.searchsorted(older, cutoff, side='right')
+            if expired == len(older):
+                expired += np.searchsorted(self._timestamps[:self.head], cutoff, side='right')
+        live = self.count - int(expired)
+        return (self.head - live) % capacity, live
+    
+    def window(self, rows: np.ndarray, cutoff: float) -> np.ndarray:
+        """Prices of the given rows for the ticks newer than cutoff, oldest first (rows x ticks)"""
+        if self._matrix is None:
+            return np.empty((len(rows), 0))
+        start, live = self._live(cutoff)
+        end = start + live
+        capacity = self._matrix.shape[1]
+        if end <= capacity:
+            return self._matrix[rows, start:end]
+        return np.concatenate((self._matrix[rows, start:], self._matrix[rows, :end - capacity]), axis=1)
+
+@dataclass(frozen=True, slots=True)
 class Signal:
     action: str  # 'buy', 'sell', 'hold'
     symbol: str
@@ -19,130 +142,132 @@ class Signal:
     timestamp: float
 
 class TradingStrategy(ABC):
-    def __init__(self):
-        self.trading_client = RecallTradingClient()
+    def __init__(self, trading_client: Optional[RecallTradingClient] = None):
+        self.trading_client = trading_client or RecallTradingClient()
+        self._worklist = (None, None, None)
+    
+    def _token_worklist(self) -> Tuple[Tuple[TokenInfo, ...], np.ndarray, np.ndarray]:
+        """Tradeable tokens with their signal thresholds and price store rows
         
+        Rebuilt only when the token config hands out a new token tuple (after a reload).
+        """
+        tokens = self.token_config.get_tradeable_tokens()
+        if tokens is not self._worklist[0]:
+            thresholds = np.fromiter(
+                (self._signal_threshold(token) for token in tokens),
+                dtype=np.float64, count=len(tokens)
+            )
+            self._worklist = (tokens, thresholds, self.price_store.rows(tokens))
+        return self._worklist
+    
     @abstractmethod
-    def generate_signals(self) -> List[Signal]:
+    def _signal_threshold(self, token: TokenInfo) -> float:
+        pass
+        
+    @abstractmethod
+    def generate_signals(self, prices: Optional[Dict[str, float]] = None, now: Optional[float] = None) -> Iterator[Signal]:
+        """Yield signals from the shared price histories
+        
+        Without prices, the strategy fetches and records them itself. A caller
+        passing prices (address -> USD) must already have recorded them at now.
+        """
         pass
     
+    def _record_prices(self, tokens) -> Tuple[Dict[str, float], float]:
+        """Fetch and record the current prices of tokens; returns them with their timestamp"""
+        prices = self._fetch_prices(tokens)
+        now = time.time()
+        self.price_store.record(tokens, prices, now)
+        return prices, now
+    
+    def _fetch_prices(self, tokens) -> Dict[str, float]:
+        """Fetch every token's price concurrently, keyed by address"""
+        return self.trading_client.get_token_prices_batch(
+            [{'address': token.address, 'chain': token.chain} for token in tokens]
+        )
+    
     @abstractmethod
     def calculate_position_size(self, signal: Signal, available_capital: float) -> float:
         pass
 
 class MomentumStrategy(TradingStrategy):
-    def __init__(self, token_config_manager: Optional[TokenConfigManager] = None):
-        super().__init__()
+    def __init__(self, token_config_manager: Optional[TokenConfigManager] = None,
+                 price_store: Optional[SharedPriceStore] = None,
+                 trading_client: Optional[RecallTradingClient] = None):
+        super().__init__(trading_client)
         self.token_config = token_config_manager or TokenConfigManager()
         self.strategy_config = self.token_config.get_strategy_config()
         self.momentum_config = self.strategy_config.get('momentum_strategy', {})
         self.lookback_period = self.momentum_config.get('lookback_hours', 12)
-        self.price_history = {}
-        
-    def generate_signals(self) -> List[Signal]:
-        signals = []
+        self._lookback_seconds = self.lookback_period * 3600.0
+        self.price_store = price_store or SharedPriceStore()
+        self.price_store.ensure_lookback(self.lookback_period)
         
+    def generate_signals(self, prices: Optional[Dict[str, float]] = None, now: Optional[float] = None) -> Iterator[Signal]:
         try:
-            # Get non-stablecoin tokens from configuration
-            tradeable_tokens = self.token_config.get_non_stablecoin_tokens()
+            # Non-stablecoin tokens from configuration, with their thresholds resolved
+            tokens, thresholds, rows = self._token_worklist()
             
-            logger.info(f"Analyzing momentum for {len(tradeable_tokens)} tokens")
+            logger.info(f"Analyzing momentum for {len(tokens)} tokens")
             
-            for token in tradeable_tokens:
-                signal = self._analyze_momentum(token)
-                if signal and signal.action != 'hold':  # Only include actionable signals
-                    signals.append(signal)
-                    logger.info(f"Generated {signal.action} signal for {token.symbol}: {signal.reason}")
-                    
-        except Exception as e:
-            logger.error(f"Error generating momentum signals: {e}")
-            
-        return signals
-    
-    def _analyze_momentum(self, token) -> Optional[Signal]:
-        try:
-            # Get current price
-            current_price = self.trading_client.get_token_price(token.address, token.chain)
-            
-            if current_price is None or current_price <= 0:
-                logger.debug(f"Cannot get valid price for {token.symbol}: {current_price}")
-                return None
+            if prices is None:
+                prices, now = self._record_prices(tokens)
             
-            # Get token-specific momentum threshold
-            momentum_threshold = token.get_momentum_threshold(self.strategy_config)
-            volatility_multiplier = token.get_volatility_multiplier(self.token_config.get_risk_config())
+            # Every token is scored at once; Python only touches the tokens that signal
+            current = _price_array(tokens, prices)
+            window = self.price_store.window(rows, now - self._lookback_seconds)
+            if window.shape[1] < 2:
+                logger.debug("Insufficient price history for momentum")
+                return
             
-            # Adjust threshold based on volatility
-            adjusted_threshold = momentum_threshold * volatility_multiplier
+            valid = ~np.isnan(window)
+            oldest = window[np.arange(len(tokens)), valid.argmax(axis=1)]  # Oldest price in the window
+            with np.errstate(invalid='ignore', divide='ignore'):
+                returns = (current - oldest) / oldest
+                enough = (valid.sum(axis=1) >= 2) & (current > 0)
+                buy = enough & (returns > thresholds)
+                sell = enough & (returns < -thresholds)
             
-            # Store price history
-            symbol_key = f"{token.symbol}_{token.chain}"
-            if symbol_key not in self.price_history:
-                self.price_history[symbol_key] = []
+            if logger.isEnabledFor(logging.DEBUG):
+                for token, recent_return, threshold, ok in zip(tokens, returns.tolist(), thresholds.tolist(), enough.tolist()):
+                    if ok:
+                        logger.debug("%s: price change %.2f%%, threshold ±%.2f%%", token.symbol, recent_return * 100, threshold * 100)
+                    else:
+                        logger.debug("Insufficient price history for %s", token.symbol)
             
-            self.price_history[symbol_key].append({
-                'price': current_price,
-                'timestamp': time.time()
-            })
-            
-            # Keep only recent prices
-            cutoff_time = time.time() - (self.lookback_period * 3600)
-            self.price_history[symbol_key] = [
-                p for p in self.price_history[symbol_key] 
-                if p['timestamp'] > cutoff_time
-            ]
-            
-            if len(self.price_history[symbol_key]) < 2:
-                logger.debug(f"Insufficient price history for {token.symbol}")
-                return None
-            
-            # Calculate momentum
-            prices = [p['price'] for p in self.price_history[symbol_key]]
-            recent_return = (prices[-1] - prices[0]) / prices[0]
-            
-            logger.debug(f"{token.symbol}: price change {recent_return:.2%}, threshold ±{adjusted_threshold:.2%}")
-            
-            if recent_return > adjusted_threshold:
-                strength = min(abs(recent_return) / adjusted_threshold, 1.0)
-                return Signal(
-                    action='buy',
+            for i in np.flatnonzero(buy | sell):
+                token = tokens[i]
+                recent_return = float(returns[i])
+                adjusted_threshold = float(thresholds[i])
+                direction = 'Positive' if buy[i] else 'Negative'
+                signal = Signal(
+                    action='buy' if buy[i] else 'sell',
                     symbol=token.symbol,
-                    strength=strength,
-                    reason=f"Positive momentum: {recent_return:.2%} (threshold: {adjusted_threshold:.2%})",
-                    timestamp=time.time()
+                    strength=min(abs(recent_return) / adjusted_threshold, 1.0),
+                    reason=f"{direction} momentum: {recent_return:.2%} (threshold: {adjusted_threshold:.2%})",
+                    timestamp=now
                 )
-            elif recent_return < -adjusted_threshold:
-                strength = min(abs(recent_return) / adjusted_threshold, 1.0)
-                return Signal(
-                    action='sell',
-                    symbol=token.symbol,
-                    strength=strength,
-                    reason=f"Negative momentum: {recent_return:.2%} (threshold: {adjusted_threshold:.2%})",
-                    timestamp=time.time()
-                )
-            
-            return Signal(
-                action='hold',
-                symbol=token.symbol,
-                strength=0.0,
-                reason=f"No significant momentum: {recent_return:.2%}",
-                timestamp=time.time()
-            )
-            
+                logger.info("Generated %s signal for %s: %s", signal.action, token.symbol, signal.reason)
+                yield signal
+                    
         except Exception as e:
-            logger.error(f"Error analyzing momentum for {token.symbol}: {e}")
-            return None
+            logger.error(f"Error generating momentum signals: {e}")
     
-    def calculate_position_size(self, signal: Signal, available_capital: float) -> float:
+    def _signal_threshold(self, token: TokenInfo) -> float:
+        # Token-specific momentum threshold, adjusted for expected volatility
+        thresholds = self.token_config.get_token_thresholds(token)
+        return thresholds.momentum * thresholds.volatility_multiplier
+    
+    def get_position_ratio(self, symbol: str) -> float:
         # Get token-specific position sizing
-        token = self.token_config.get_token_by_symbol(signal.symbol)
+        token = self.token_config.get_token_by_symbol(symbol)
         if token:
-            base_ratio = token.get_position_size_ratio(self.strategy_config)
-        else:
-            base_ratio = 0.1  # Default 10%
-        
+            return self.token_config.get_token_thresholds(token).position_size_ratio
+        return 0.1  # Default 10%
+    
+    def calculate_position_size(self, signal: Signal, available_capital: float) -> float:
         # Position size based on signal strength and token category
-        base_position_size = available_capital * base_ratio
+        base_position_size = available_capital * self.get_position_ratio(signal.symbol)
         position_size = base_position_size * signal.strength
         
         # Apply maximum position size limit
@@ -150,196 +275,193 @@ class MomentumStrategy(TradingStrategy):
         return min(position_size, max_position)
 
 class MeanReversionStrategy(TradingStrategy):
-    def __init__(self, token_config_manager: Optional[TokenConfigManager] = None):
-        super().__init__()
+    def __init__(self, token_config_manager: Optional[TokenConfigManager] = None,
+                 price_store: Optional[SharedPriceStore] = None,
+                 trading_client: Optional[RecallTradingClient] = None):
+        super().__init__(trading_client)
         self.token_config = token_config_manager or TokenConfigManager()
         self.strategy_config = self.token_config.get_strategy_config()
         self.reversion_config = self.strategy_config.get('mean_reversion_strategy', {})
         self.lookback_period = self.reversion_config.get('lookback_hours', 24)
-        self.price_history = {}
+        self._lookback_seconds = self.lookback_period * 3600.0
+        self.price_store = price_store or SharedPriceStore()
+        self.price_store.ensure_lookback(self.lookback_period)
         
-    def generate_signals(self) -> List[Signal]:
-        signals = []
-        
-        try:
-            # Get non-stablecoin tokens from configuration
-            tradeable_tokens = self.token_config.get_non_stablecoin_tokens()
-            
-            logger.info(f"Analyzing mean reversion for {len(tradeable_tokens)} tokens")
-            
-            for token in tradeable_tokens:
-                signal = self._analyze_mean_reversion(token)
-                if signal and signal.action != 'hold':  # Only include actionable signals
-                    signals.append(signal)
-                    logger.info(f"Generated {signal.action} signal for {token.symbol}: {signal.reason}")
-                    
-        except Exception as e:
-            logger.error(f"Error generating mean reversion signals: {e}")
-            
-        return signals
-    
-    def _analyze_mean_reversion(self, token) -> Optional[Signal]:
+    def generate_signals(self, prices: Optional[Dict[str, float]] = None, now: Optional[float] = None) -> Iterator[Signal]:
         try:
-            current_price = self.trading_client.get_token_price(token.address, token.chain)
+            # Non-stablecoin tokens from configuration, with their thresholds resolved
+            tokens, thresholds, rows = self._token_worklist()
             
-            if current_price is None or current_price <= 0:
-                logger.debug(f"Cannot get valid price for {token.symbol}: {current_price}")
-                return None
+            logger.info(f"Analyzing mean reversion for {len(tokens)} tokens")
             
-            # Get token-specific z-score threshold
-            z_score_threshold = token.get_z_score_threshold(self.strategy_config)
+            if prices is None:
+                prices, now = self._record_prices(tokens)
             
-            symbol_key = f"{token.symbol}_{token.chain}"
-            if symbol_key not in self.price_history:
-                self.price_history[symbol_key] = []
+            # Every token is scored at once; Python only touches the tokens that signal
+            current = _price_array(tokens, prices)
+            window = self.price_store.window(rows, now - self._lookback_seconds)
+            counts = np.count_nonzero(~np.isnan(window), axis=1)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                # Mean and variance from one pass of sums per token
+                mean = np.nansum(window, axis=1) / counts
+                variance = np.nansum(window * window, axis=1) / counts - mean * mean
+                z_scores = (current - mean) / np.sqrt(variance)
+                # Need enough data for statistics; the sums can leave rounding
+                # noise where the spread is truly zero, so treat that as flat
+                usable = (counts >= 10) & (current > 0) & (variance > _MIN_RELATIVE_VARIANCE * mean * mean)
+                sell = usable & (z_scores > thresholds)
+                buy = usable & (z_scores < -thresholds)
             
-            self.price_history[symbol_key].append({
-                'price': current_price,
-                'timestamp': time.time()
-            })
+            if logger.isEnabledFor(logging.DEBUG):
+                for token, z_score, threshold, ok in zip(tokens, z_scores.tolist(), thresholds.tolist(), usable.tolist()):
+                    if ok:
+                        logger.debug("%s: Z-score %.2f, threshold ±%.2f", token.symbol, z_score, threshold)
+                    else:
+                        logger.debug("Insufficient price history for %s mean reversion", token.symbol)
             
-            # Keep only recent prices
-            cutoff_time = time.time() - (self.lookback_period * 3600)
-            self.price_history[symbol_key] = [
-                p for p in self.price_history[symbol_key] 
-                if p['timestamp'] > cutoff_time
-            ]
-            
-            if len(self.price_history[symbol_key]) < 10:  # Need enough data for statistics
-                logger.debug(f"Insufficient price history for {token.symbol} mean reversion")
-                return None
-            
-            prices = np.array([p['price'] for p in self.price_history[symbol_key]])
-            mean_price = np.mean(prices)
-            std_price = np.std(prices)
-            
-            if std_price == 0:
-                return None
-            
-            z_score = (current_price - mean_price) / std_price
-            
-            logger.debug(f"{token.symbol}: Z-score {z_score:.2f}, threshold ±{z_score_threshold:.2f}")
-            
-            if z_score > z_score_threshold:
-                strength = min(abs(z_score) / z_score_threshold, 1.0)
-                return Signal(
-                    action='sell',
+            for i in np.flatnonzero(buy | sell):
+                token = tokens[i]
+                z_score = float(z_scores[i])
+                z_score_threshold = float(thresholds[i])
+                level = 'low' if buy[i] else 'high'
+                signal = Signal(
+                    action='buy' if buy[i] else 'sell',
                     symbol=token.symbol,
-                    strength=strength,
-                    reason=f"Price too high (Z-score: {z_score:.2f}, threshold: {z_score_threshold:.2f})",
-                    timestamp=time.time()
+                    strength=min(abs(z_score) / z_score_threshold, 1.0),
+                    reason=f"Price too {level} (Z-score: {z_score:.2f}, threshold: {z_score_threshold:.2f})",
+                    timestamp=now
                 )
-            elif z_score < -z_score_threshold:
-                strength = min(abs(z_score) / z_score_threshold, 1.0)
-                return Signal(
-                    action='buy',
-                    symbol=token.symbol,
-                    strength=strength,
-                    reason=f"Price too low (Z-score: {z_score:.2f}, threshold: {z_score_threshold:.2f})",
-                    timestamp=time.time()
-                )
-            
-            return Signal(
-                action='hold',
-                symbol=token.symbol,
-                strength=0.0,
-                reason=f"Price normal (Z-score: {z_score:.2f})",
-                timestamp=time.time()
-            )
-            
+                logger.info("Generated %s signal for %s: %s", signal.action, token.symbol, signal.reason)
+                yield signal
+                    
         except Exception as e:
-            logger.error(f"Error analyzing mean reversion for {token.symbol}: {e}")
-            return None
+            logger.error(f"Error generating mean reversion signals: {e}")
     
-    def calculate_position_size(self, signal: Signal, available_capital: float) -> float:
+    def _signal_threshold(self, token: TokenInfo) -> float:
+        # Token-specific z-score threshold
+        return self.token_config.get_token_thresholds(token).z_score
+    
+    def get_position_ratio(self, symbol: str) -> float:
         # Get token-specific position sizing (more conservative for mean reversion)
-        token = self.token_config.get_token_by_symbol(signal.symbol)
+        token = self.token_config.get_token_by_symbol(symbol)
         if token:
-            base_ratio = token.get_position_size_ratio(self.strategy_config) * 0.5  # Half size for mean reversion
-        else:
-            base_ratio = 0.05  # Default 5%
-        
-        base_position_size = available_capital * base_ratio
+            return self.token_config.get_token_thresholds(token).position_size_ratio * 0.5  # Half size for mean reversion
+        return 0.05  # Default 5%
+    
+    def calculate_position_size(self, signal: Signal, available_capital: float) -> float:
+        base_position_size = available_capital * self.get_position_ratio(signal.symbol)
         position_size = base_position_size * signal.strength
         
         max_position = available_capital * Config.MAX_POSITION_SIZE
         return min(position_size, max_position)
 
 class MultiStrategyManager:
-    def __init__(self):
+    def __init__(self, trading_client: Optional[RecallTradingClient] = None):
+        # One client (and so one response cache) shared by the manager and its strategies
+        self.trading_client = trading_client or RecallTradingClient()
         self.token_config = TokenConfigManager()
+        self.price_store = SharedPriceStore()
         self.strategies = [
-            MomentumStrategy(self.token_config),
-            MeanReversionStrategy(self.token_config)
+            MomentumStrategy(self.token_config, self.price_store, self.trading_client),
+            MeanReversionStrategy(self.token_config, self.price_store, self.trading_client)
         ]
-        self.trading_client = RecallTradingClient()
         
         # Log configuration summary
         logger.info("Multi-Strategy Trading System Initialized")
         logger.info(self.token_config.get_token_summary())
         
+    def record_prices(self) -> Tuple[Dict[str, float], float]:
+        """Fetch and record the tradeable tokens' prices once for every strategy
+        
+        Returns the prices (address -> USD) with their timestamp, ready to pass
+        to each strategy's generate_signals().
+        """
+        tokens = self.token_config.get_tradeable_tokens()
+        prices = self.trading_client.get_token_prices_batch(
+            [{'address': token.address, 'chain': token.chain} for token in tokens]
+        )
+        now = time.time()
+        self.price_store.record(tokens, prices, now)
+        return prices, now
+    
     def generate_combined_signals(self) -> List[Signal]:
-        all_signals = []
+        # Both strategies analyze the same tokens, so fetch and record their prices once
+        try:
+            prices, now = self.record_prices()
+        except Exception as e:
+            logger.error(f"Error fetching prices for signal generation: {e}")
+            return []
         
+        # Combine signals by symbol as the strategies yield them
+        return self._combine_signals_by_symbol(self._strategy_signals(prices, now))
+    
+    def _strategy_signals(self, prices: Dict[str, float], now: float) -> Iterator[Signal]:
         for strategy in self.strategies:
             try:
-                signals = strategy.generate_signals()
-                all_signals.extend(signals)
+                yield from strategy.generate_signals(prices, now)
             except Exception as e:
                 logger.error(f"Error getting signals from {strategy.__class__.__name__}: {e}")
-        
-        # Combine signals by symbol
-        combined_signals = self._combine_signals_by_symbol(all_signals)
-        return combined_signals
     
-    def _combine_signals_by_symbol(self, signals: List[Signal]) -> List[Signal]:
-        signal_groups = {}
-        
-        for signal in signals:
-            if signal.symbol not in signal_groups:
-                signal_groups[signal.symbol] = []
-            signal_groups[signal.symbol].append(signal)
+    def calculate_position_sizes(self, signals: List[Signal], available_capital: float) -> np.ndarray:
+        """Size all signals at once with the primary strategy's rules
         
-        combined_signals = []
+        Signals that aren't strong buy/sell signals, or whose size falls below
+        MIN_TRADE_AMOUNT, get a size of 0.
+        """
+        strategy = self.strategies[0]
+        count = len(signals)
+        ratios = np.fromiter((strategy.get_position_ratio(s.symbol) for s in signals), dtype=np.float64, count=count)
+        strengths = np.fromiter((s.strength for s in signals), dtype=np.float64, count=count)
+        actionable = np.fromiter((s.action in ('buy', 'sell') for s in signals), dtype=bool, count=count)
         
-        for symbol, symbol_signals in signal_groups.items():
-            if len(symbol_signals) == 1:
-                combined_signals.append(symbol_signals[0])
-            else:
-                # Combine multiple signals for the same symbol
-                combined_signal = self._combine_signals(symbol_signals)
-                combined_signals.append(combined_signal)
-        
-        return combined_signals
+        sizes = np.minimum(available_capital * ratios * strengths, available_capital * Config.MAX_POSITION_SIZE)
+        sizes[~actionable | (strengths <= 0.1) | (sizes < Config.MIN_TRADE_AMOUNT)] = 0.0  # Only act on strong signals
+        return sizes
     
-    def _combine_signals(self, signals: List[Signal]) -> Signal:
-        buy_signals = [s for s in signals if s.action == 'buy']
-        sell_signals = [s for s in signals if s.action == 'sell']
-        
-        buy_strength = sum(s.strength for s in buy_signals)
-        sell_strength = sum(s.strength for s in sell_signals)
+    def _combine_signals_by_symbol(self, signals: Iterable[Signal]) -> List[Signal]:
+        # symbol -> [first signal, signal count, buy strength, sell strength, buy count, sell count]
+        totals = {}
+        for signal in signals:
+            entry = totals.get(signal.symbol)
+            if entry is None:
+                entry = totals[signal.symbol] = [signal, 0, 0.0, 0.0, 0, 0]
+            entry[1] += 1
+            if signal.action == 'buy':
+                entry[2] += signal.strength
+                entry[4] += 1
+            elif signal.action == 'sell':
+                entry[3] += signal.strength
+                entry[5] += 1
         
+        # A lone signal passes through unchanged; several for a symbol are netted
+        return [
+            first if count == 1 else self._combine_signals(first.symbol, *strengths_and_counts)
+            for first, count, *strengths_and_counts in totals.values()
+        ]
+    
+    def _combine_signals(self, symbol: str, buy_strength: float, sell_strength: float,
+                         buy_count: int, sell_count: int) -> Signal:
         if buy_strength > sell_strength:
             return Signal(
                 action='buy',
-                symbol=signals[0].symbol,
+                symbol=symbol,
                 strength=buy_strength - sell_strength,
-                reason=f"Combined buy signals: {len(buy_signals)} buy, {len(sell_signals)} sell",
+                reason=f"Combined buy signals: {buy_count} buy, {sell_count} sell",
                 timestamp=time.time()
             )
         elif sell_strength > buy_strength:
             return Signal(
                 action='sell',
-                symbol=signals[0].symbol,
+                symbol=symbol,
                 strength=sell_strength - buy_strength,
-                reason=f"Combined sell signals: {len(sell_signals)} sell, {len(buy_signals)} buy",
+                reason=f"Combined sell signals: {sell_count} sell, {buy_count} buy",
                 timestamp=time.time()
             )
         else:
             return Signal(
                 action='hold',
-                symbol=signals[0].symbol,
+                symbol=symbol,
                 strength=0.0,
                 reason="Conflicting signals",
                 timestamp=time.time()
-            )
\ No newline at end of file
+            )
@@ -10,6 +10,8 @@ from src.trading_client import RecallTradingClient
 from src.portfolio_manager import PortfolioManager
 import json
 
+CHAIN_EMOJI = {"ethereum": "⚡", "solana": "🚀"}
+
 def test_evm_functionality():
     """Test EVM token support and trading"""
     print("Testing EVM Trading Functionality")
@@ -25,12 +27,15 @@ def test_evm_functionality():
         portfolio_status = portfolio_manager.get_portfolio_status()
         print(f"Found {len(portfolio_status)} tokens in portfolio:")
         
-        total_value = sum(target.current_value for target in portfolio_status.values())
+        total_value = portfolio_status.columns().current_value.sum()
         print(f"Total portfolio value: ${total_value:,.2f}")
         
+        # Resolve every symbol's chain once; the trade checks below reuse it
+        chain_map = {symbol: portfolio_manager._get_token_chain(symbol) for symbol in portfolio_status}
+        
         for symbol, target in portfolio_status.items():
-            chain = portfolio_manager._get_token_chain(symbol)
-            chain_emoji = "⚡" if chain == "ethereum" else "🚀" if chain == "solana" else "🔗"
+            chain = chain_map[symbol]
+            chain_emoji = CHAIN_EMOJI.get(chain, "🔗")
             print(f"  {chain_emoji} {symbol} ({chain}): Target {target.target_allocation:.1%} | "
                   f"Current {target.current_allocation:.1%} | "
                   f"Drift {target.drift:+.1%} | "
@@ -45,25 +50,23 @@ def test_evm_functionality():
     # Test 2: Check price fetching for EVM tokens
     print("\n2. Testing price fetching for EVM tokens:")
     try:
-        # Test WETH price
         weth_address = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
-        weth_price = trading_client.get_token_price(weth_address, "ethereum")
-        print(f"  WETH price: ${weth_price:,.2f}")
-        
-        # Test USDC price on Ethereum
         usdc_eth_address = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
-        usdc_eth_price = trading_client.get_token_price(usdc_eth_address, "ethereum")
-        print(f"  USDC (Ethereum) price: ${usdc_eth_price:.4f}")
-        
-        # Test SOL price
         sol_address = "So11111111111111111111111111111111111111112"
-        sol_price = trading_client.get_token_price(sol_address, "solana")
-        print(f"  SOL price: ${sol_price:.2f}")
-        
-        # Test USDC price on Solana
         usdc_sol_address = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
-        usdc_sol_price = trading_client.get_token_price(usdc_sol_address, "solana")
-        print(f"  USDC (Solana) price: ${usdc_sol_price:.4f}")
+        
+        # All four quotes go out together instead of one round-trip each
+        prices = trading_client.get_token_prices_batch([
+            {'address': weth_address, 'chain': "ethereum"},
+            {'address': usdc_eth_address, 'chain': "ethereum"},
+            {'address': sol_address, 'chain': "solana"},
+            {'address': usdc_sol_address, 'chain': "solana"},
+        ])
+        
+        print(f"  WETH price: ${prices[weth_address]:,.2f}")
+        print(f"  USDC (Ethereum) price: ${prices[usdc_eth_address]:.4f}")
+        print(f"  SOL price: ${prices[sol_address]:.2f}")
+        print(f"  USDC (Solana) price: ${prices[usdc_sol_address]:.4f}")
         
         print("✅ Price fetching test passed")
         
@@ -78,11 +81,11 @@ def test_evm_functionality():
         print(f"Found {len(trades)} potential rebalance trades:")
         
         for from_symbol, to_symbol, amount in trades:
-            from_chain = portfolio_manager._get_token_chain(from_symbol)
-            to_chain = portfolio_manager._get_token_chain(to_symbol)
+            from_chain = chain_map.get(from_symbol)
+            to_chain = chain_map.get(to_symbol)
             
             if from_chain == to_chain:
-                chain_emoji = "⚡" if from_chain == "ethereum" else "🚀" if from_chain == "solana" else "🔗"
+                chain_emoji = CHAIN_EMOJI.get(from_chain, "🔗")
                 print(f"  {chain_emoji} {from_symbol} -> {to_symbol}: ${amount:,.2f} (same chain: {from_chain})")
             else:
                 print(f"  ❌ {from_symbol} ({from_chain}) -> {to_symbol} ({to_chain}): ${amount:,.2f} (cross-chain - not supported)")
@@ -105,7 +108,7 @@ def test_evm_functionality():
         
         for token_address in test_tokens:
             token_info = trading_client.get_token_info(token_address)
-            chain_emoji = "⚡" if token_info['chain'] == "ethereum" else "🚀" if token_info['chain'] == "solana" else "🔗"
+            chain_emoji = CHAIN_EMOJI.get(token_info['chain'], "🔗")
             print(f"  {chain_emoji} {token_address[:10]}... -> {token_info['symbol']} on {token_info['chain']}")
         
         print("✅ Token info lookup test passed")
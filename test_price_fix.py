@@ -6,10 +6,10 @@ Test script to verify price fetching fixes
 import sys
 sys.path.append('src')
 
-from src.trading_client import RecallTradingClient
+from src.trading_client import RecallTradingClient, MAX_PRICE_REQUESTS
 from src.token_config import TokenConfigManager
 from src.market_data import PriceMonitor, MarketDataProvider
-import time
+from concurrent.futures import ThreadPoolExecutor
 
 def test_price_fetching():
     """Test price fetching for all configured tokens"""
@@ -19,7 +19,8 @@ def test_price_fetching():
     # Initialize components
     trading_client = RecallTradingClient()
     token_config = TokenConfigManager()
-    market_data = MarketDataProvider()
+    # Share the client so the market data lookups reuse its cached quotes
+    market_data = MarketDataProvider(trading_client)
     
     # Get all enabled tokens
     tokens = token_config.get_enabled_tokens()
@@ -30,38 +31,48 @@ def test_price_fetching():
     print(f"Testing {len(tokens)} tokens:")
     print("-" * 30)
     
-    for token in tokens:
+    # Issue every request up front so the wall clock is bounded by the
+    # slowest token rather than the sum of all round-trips
+    # Method 1: Direct trading client call
+    direct_prices = trading_client.get_token_prices_batch(
+        [{'address': token.address, 'chain': token.chain} for token in tokens]
+    )
+    
+    # Method 2: Market data provider call
+    def fetch_market_price(token):
         try:
-            # Test direct API call
-            print(f"🔄 Testing {token.symbol} ({token.chain})...")
-            
-            # Method 1: Direct trading client call
-            price1 = trading_client.get_token_price(token.address, token.chain)
-            
-            # Method 2: Market data provider call
-            price2 = market_data.get_current_price_by_symbol(token.symbol)
-            
-            if price1 is not None and price1 > 0:
-                print(f"  ✅ Direct API: ${price1:.6f}")
-                successful_prices += 1
-            else:
-                print(f"  ❌ Direct API: {price1}")
-                failed_prices += 1
-            
-            if price2 is not None and price2 > 0:
-                print(f"  ✅ Market Data: ${price2:.6f}")
-            else:
-                print(f"  ❌ Market Data: {price2}")
-            
-            # Check consistency
-            if price1 and price2 and abs(price1 - price2) > 0.0001:
-                print(f"  ⚠️  Price mismatch: {price1:.6f} vs {price2:.6f}")
-            
-            time.sleep(0.1)  # Rate limiting
-            
+            return market_data.get_current_price_by_symbol(token.symbol), None
         except Exception as e:
-            print(f"  💥 Error testing {token.symbol}: {e}")
+            return None, e
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(MAX_PRICE_REQUESTS, len(tokens)))) as executor:
+        market_prices = list(executor.map(fetch_market_price, tokens))
+    
+    for token, (price2, error) in zip(tokens, market_prices):
+        print(f"🔄 Testing {token.symbol} ({token.chain})...")
+        
+        if error is not None:
+            print(f"  💥 Error testing {token.symbol}: {error}")
             failed_prices += 1
+            continue
+        
+        price1 = direct_prices.get(token.address)
+        
+        if price1 is not None and price1 > 0:
+            print(f"  ✅ Direct API: ${price1:.6f}")
+            successful_prices += 1
+        else:
+            print(f"  ❌ Direct API: {price1}")
+            failed_prices += 1
+        
+        if price2 is not None and price2 > 0:
+            print(f"  ✅ Market Data: ${price2:.6f}")
+        else:
+            print(f"  ❌ Market Data: {price2}")
+        
+        # Check consistency
+        if price1 and price2 and abs(price1 - price2) > 0.0001:
+            print(f"  ⚠️  Price mismatch: {price1:.6f} vs {price2:.6f}")
     
     print("-" * 30)
     print(f"📊 Results: {successful_prices} successful, {failed_prices} failed")
@@ -82,23 +93,24 @@ def test_price_monitor():
         
         print(f"Monitoring {len(symbols)} symbols...")
         
+        # Fetch once; the baseline and the changed run both reuse this snapshot
+        prices = price_monitor.fetch_prices(symbols)
+        
         # First run to establish baseline
-        alerts1 = price_monitor.monitor_prices(symbols)
+        alerts1 = price_monitor.monitor_prices(symbols, prices)
         print(f"First run alerts: {len(alerts1)}")
         
-        time.sleep(1)
-        
-        # Second run to check for changes
-        alerts2 = price_monitor.monitor_prices(symbols)
+        # Second run with every price moved 2% to check change detection
+        moved = {symbol: price * 1.02 if price else price for symbol, price in prices.items()}
+        alerts2 = price_monitor.monitor_prices(symbols, moved)
         print(f"Second run alerts: {len(alerts2)}")
         
         # Display price status
         print("\n📈 Current Prices:")
         for symbol in symbols:
-            if symbol in price_monitor.last_prices:
-                price = price_monitor.last_prices[symbol]
-                status = "✅" if price and price > 0 else "❌"
-                print(f"  {status} {symbol}: ${price:.6f}" if price else f"  {status} {symbol}: None")
+            price = prices[symbol]
+            status = "✅" if price and price > 0 else "❌"
+            print(f"  {status} {symbol}: ${price:.6f}" if price else f"  {status} {symbol}: None")
         
         return True
         
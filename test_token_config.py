@@ -118,12 +118,15 @@ def test_signal_generation_details():
         token_config = TokenConfigManager()
         strategy_manager = MultiStrategyManager()
         
+        # Fetch prices once for all strategies instead of once per strategy
+        prices, now = strategy_manager.record_prices()
+        
         # Test each strategy individually
         for i, strategy in enumerate(strategy_manager.strategies):
             strategy_name = strategy.__class__.__name__
             print(f"\n📈 Testing {strategy_name}:")
             
-            signals = strategy.generate_signals()
+            signals = list(strategy.generate_signals(prices, now))
             print(f"Generated {len(signals)} signals from {strategy_name}")
             
             for signal in signals:
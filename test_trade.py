@@ -5,7 +5,19 @@ Test Recall API trading functionality with custom API key
 
 import requests
 import sys
-import json
+import os
+import orjson
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# One keep-alive pool for every probe so the TLS handshake is paid once
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16,
+                                      max_retries=Retry(total=2, backoff_factor=0.2)))
+
+logger = logging.getLogger(__name__)
 
 def test_recall_trade(api_key):
     """Test the Recall trading API with the provided key"""
@@ -26,27 +38,28 @@ def test_recall_trade(api_key):
     
     print(f"Testing API Key: {api_key[:10]}...")
     print(f"URL: {url}")
-    print(f"Payload: {json.dumps(payload, indent=2)}")
+    # Full request/response dumps only with LOG_LEVEL=DEBUG
+    logger.debug("Payload: %s", payload)
     print("=" * 60)
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=30)
+        response = SESSION.post(url, data=orjson.dumps(payload), headers=headers, timeout=30)
         
         print(f"Status Code: {response.status_code}")
-        print(f"Response Headers: {dict(response.headers)}")
+        logger.debug("Response Headers: %s", response.headers)
         
         try:
-            response_data = response.json()
-            print(f"Response Data: {json.dumps(response_data, indent=2)}")
+            response_data = orjson.loads(response.content)
+            logger.debug("Response Data: %s", response_data)
             
             if response.status_code == 200 and response_data.get('success'):
                 print("✅ Trade executed successfully!")
                 return True
             else:
-                print("❌ Trade failed!")
+                print(f"❌ Trade failed: {response_data.get('error', 'Unknown error')}")
                 return False
                 
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             print(f"Raw Response: {response.text}")
             return False
             
@@ -73,36 +86,44 @@ def test_other_endpoints(api_key):
     print("\nTesting other endpoints:")
     print("=" * 40)
     
-    for endpoint in endpoints:
+    def fetch(endpoint):
         try:
-            url = f"{base_url}{endpoint}"
-            response = requests.get(url, headers=headers, timeout=10)
-            
-            print(f"{endpoint}: {response.status_code}")
-            
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    print(f"  ✅ Success: {json.dumps(data, indent=2)[:200]}...")
-                except:
-                    print(f"  ✅ Success: {response.text[:100]}...")
-            else:
-                try:
-                    error = response.json()
-                    print(f"  ❌ Error: {error.get('error', 'Unknown error')}")
-                except:
-                    print(f"  ❌ Error: {response.text[:100]}")
-                    
+            return SESSION.get(f"{base_url}{endpoint}", headers=headers, timeout=10), None
         except Exception as e:
-            print(f"{endpoint}: ❌ Exception: {e}")
+            return None, e
+    
+    # Probe all endpoints at once, then report in order
+    with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+        results = list(executor.map(fetch, endpoints))
+    
+    for endpoint, (response, error) in zip(endpoints, results):
+        if error is not None:
+            print(f"{endpoint}: ❌ Exception: {error}")
+            continue
+        
+        print(f"{endpoint}: {response.status_code}")
+        
+        if response.status_code == 200:
+            try:
+                data = orjson.loads(response.content)
+                print(f"  ✅ Success: {orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()[:200]}...")
+            except:
+                print(f"  ✅ Success: {response.text[:100]}...")
+        else:
+            try:
+                error = orjson.loads(response.content)
+                print(f"  ❌ Error: {error.get('error', 'Unknown error')}")
+            except:
+                print(f"  ❌ Error: {response.text[:100]}")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), format="%(message)s")
+    
     # You can pass the API key as a command line argument
     if len(sys.argv) > 1:
         api_key = sys.argv[1]
     else:
         # Or use the one from the .env file
-        import os
         from dotenv import load_dotenv
         load_dotenv()
         api_key = os.getenv("TRADING_SIM_API_KEY", "")
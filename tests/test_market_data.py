@@ -0,0 +1,56 @@
+import unittest
+import sys
+import os
+
+# Add repo root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.market_data import PriceMonitor
+
+class TestPriceMonitor(unittest.TestCase):
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.monitor = PriceMonitor(price_change_threshold=0.05)
+    
+    def test_change_alert(self):
+        """Test that a move past the threshold alerts"""
+        self.monitor.monitor_prices(['A'], {'A': 100.0})
+        
+        alerts = self.monitor.monitor_prices(['A'], {'A': 110.0})
+        
+        self.assertEqual([alert['symbol'] for alert in alerts], ['A'])
+        self.assertAlmostEqual(alerts[0]['change'], 0.10)
+    
+    def test_symbol_leaving_and_returning_keeps_last_price(self):
+        """Test that a symbol dropped from the watch list still alerts when it comes back"""
+        self.monitor.monitor_prices(['A', 'B'], {'A': 100.0, 'B': 50.0})
+        self.monitor.monitor_prices(['B'], {'B': 50.0})
+        
+        self.assertEqual(self.monitor.last_prices, {'A': 100.0, 'B': 50.0})
+        
+        alerts = self.monitor.monitor_prices(['A', 'B'], {'A': 200.0, 'B': 50.0})
+        
+        self.assertEqual([alert['symbol'] for alert in alerts], ['A'])
+        self.assertEqual(alerts[0]['last_price'], 100.0)
+    
+    def test_invalid_last_price_does_not_alert(self):
+        """Test that seeded zero or missing last prices are replaced without alerting"""
+        self.monitor.last_prices = {'A': 0.0, 'B': None}
+        
+        alerts = self.monitor.monitor_prices(['A', 'B'], {'A': 1.0, 'B': 2.0})
+        
+        self.assertEqual(alerts, [])
+        self.assertEqual(self.monitor.last_prices, {'A': 1.0, 'B': 2.0})
+
+    def test_missing_price_is_skipped(self):
+        """Test that a symbol absent from the given prices is treated as unpriced"""
+        self.monitor.monitor_prices(['A', 'B'], {'A': 100.0, 'B': 50.0})
+        
+        alerts = self.monitor.monitor_prices(['A', 'B'], {'B': 100.0})
+        
+        self.assertEqual([alert['symbol'] for alert in alerts], ['B'])
+        self.assertEqual(self.monitor.last_prices['A'], 100.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import unittest
+import sys
+import os
+
+# Add repo root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.portfolio_manager import PortfolioManager
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'portfolio_config.json')
+
+class TestPortfolioManager(unittest.TestCase):
+    
+    def test_config_not_shared_between_managers(self):
+        """Test that mutating one manager's config leaves later managers untouched"""
+        first = PortfolioManager(CONFIG_PATH)
+        expected = dict(first.target_allocations)
+        
+        first.target_allocations.clear()
+        first.config["rebalance_threshold"] = 1.0
+        second = PortfolioManager(CONFIG_PATH)
+        
+        self.assertEqual(second.target_allocations, expected)
+        self.assertNotEqual(second.config.get("rebalance_threshold"), 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
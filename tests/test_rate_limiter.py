@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add repo root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.rate_limiter import RateLimiter
+
+class TestRateLimiter(unittest.TestCase):
+    
+    def setUp(self):
+        """Run the limiter on a fake clock that sleeping advances"""
+        self.now = 0.0
+        self.sleeps = []
+        time_patcher = patch('src.rate_limiter.time')
+        mock_time = time_patcher.start()
+        self.addCleanup(time_patcher.stop)
+        mock_time.monotonic.side_effect = lambda: self.now
+        mock_time.sleep.side_effect = self.sleep
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+    
+    def test_burst_limited_to_capacity(self):
+        """Test that only `capacity` calls pass without blocking"""
+        limiter = RateLimiter(30, 60, capacity=4)
+        
+        for _ in range(4):
+            limiter.acquire()
+        self.assertEqual(self.sleeps, [])
+        
+        limiter.acquire()
+        
+        self.assertEqual(len(self.sleeps), 1)
+        self.assertAlmostEqual(self.now, 2.0)
+    
+    def test_sustained_rate(self):
+        """Test that after the burst calls are paced at rate per period"""
+        limiter = RateLimiter(30, 60, capacity=1)
+        
+        for _ in range(11):
+            limiter.acquire()
+        
+        self.assertAlmostEqual(self.now, 20.0)
+    
+    def test_refill_capped_at_capacity(self):
+        """Test that an idle bucket refills only up to its capacity"""
+        limiter = RateLimiter(30, 60, capacity=2)
+        limiter.acquire()
+        limiter.acquire()
+        
+        self.now += 600
+        for _ in range(2):
+            limiter.acquire()
+        self.assertEqual(self.sleeps, [])
+        
+        limiter.acquire()
+        
+        self.assertEqual(len(self.sleeps), 1)
+    
+    def test_capacity_defaults_to_rate(self):
+        """Test that without a capacity the whole rate may burst"""
+        limiter = RateLimiter(3)
+        
+        for _ in range(3):
+            limiter.acquire()
+        
+        self.assertEqual(self.sleeps, [])
+
+if __name__ == '__main__':
+    unittest.main()
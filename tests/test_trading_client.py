@@ -2,20 +2,45 @@ import unittest
 from unittest.mock import Mock, patch
 import sys
 import os
+import orjson
+import threading
+import time
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from trading_client import RecallTradingClient, Token, Balance
+from trading_client import RecallTradingClient, Token, Balance, TRADE_REQUEST_TIMEOUT
 
 class TestRecallTradingClient(unittest.TestCase):
     
+    # Built once and shared; the records are frozen so tests cannot mutate them
+    BALANCES_RESPONSE = orjson.dumps({
+        "balances": [
+            {
+                "tokenAddress": "0x123",
+                "symbol": "WETH",
+                "chain": "ethereum",
+                "amount": "1.5",
+                "usd_value": "3000.0"
+            }
+        ]
+    })
+    EXPECTED_BALANCES = [Balance(Token("0x123", "WETH", "ethereum", 18), 1.5, 3000.0)]
+    
     def setUp(self):
         """Set up test fixtures"""
         with patch('trading_client.Config') as mock_config:
             mock_config.TRADING_SIM_API_KEY = "test_api_key"
             mock_config.TRADING_SIM_API_URL = "https://test.api.com"
             self.client = RecallTradingClient()
+        
+        # Patch the session once per test instead of decorating each one
+        get_patcher = patch('trading_client.requests.Session.get')
+        self.mock_get = get_patcher.start()
+        self.addCleanup(get_patcher.stop)
+        post_patcher = patch('trading_client.requests.Session.post')
+        self.mock_post = post_patcher.start()
+        self.addCleanup(post_patcher.stop)
     
     def test_initialization(self):
         """Test client initialization"""
@@ -23,54 +48,56 @@ class TestRecallTradingClient(unittest.TestCase):
         self.assertIsNotNone(self.client.base_url)
         self.assertIn("Authorization", self.client.session.headers)
     
-    @patch('trading_client.requests.Session.get')
-    def test_get_portfolio_success(self, mock_get):
+    def test_get_portfolio_success(self):
         """Test successful portfolio retrieval"""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"total_value": 1000.0}
-        mock_get.return_value = mock_response
+        mock_response.content = orjson.dumps({"total_value": 1000.0})
+        self.mock_get.return_value = mock_response
         
         result = self.client.get_portfolio()
         
         self.assertEqual(result["total_value"], 1000.0)
-        mock_get.assert_called_once()
+        self.mock_get.assert_called_once()
     
-    @patch('trading_client.requests.Session.get')
-    def test_get_balances_success(self, mock_get):
+    def test_get_balances_success(self):
         """Test successful balances retrieval"""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "balances": [
-                {
-                    "token": {
-                        "address": "0x123",
-                        "symbol": "WETH",
-                        "chain": "ethereum",
-                        "decimals": 18
-                    },
-                    "amount": "1.5",
-                    "usd_value": "3000.0"
-                }
-            ]
-        }
-        mock_get.return_value = mock_response
+        mock_response.content = self.BALANCES_RESPONSE
+        self.mock_get.return_value = mock_response
         
         balances = self.client.get_balances()
         
-        self.assertEqual(len(balances), 1)
-        self.assertIsInstance(balances[0], Balance)
-        self.assertEqual(balances[0].token.symbol, "WETH")
-        self.assertEqual(balances[0].amount, 1.5)
+        self.assertEqual(balances, self.EXPECTED_BALANCES)
+    
+    def test_get_token_price_non_json_body(self):
+        """Test that a 200 response with a non-JSON body is treated as a failed quote"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.content = b"<html>Bad Gateway</html>"
+        self.mock_get.return_value = mock_response
+        
+        self.assertIsNone(self.client.get_token_price("0x123", "ethereum"))
+        self.assertEqual(
+            self.client.get_token_prices_batch([{'address': "0x456", 'chain': "ethereum"}]),
+            {}
+        )
+    
+    def test_balance_records_are_slotted(self):
+        """Test that Token and Balance carry no per-instance __dict__"""
+        token = Token(address="0x123", symbol="WETH", chain="ethereum")
+        balance = Balance(token=token, amount=1.5, usd_value=3000.0)
+        
+        self.assertFalse(hasattr(token, "__dict__"))
+        self.assertFalse(hasattr(balance, "__dict__"))
     
-    @patch('trading_client.requests.Session.post')
-    def test_execute_trade_success(self, mock_post):
+    def test_execute_trade_success(self):
         """Test successful trade execution"""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"tx_hash": "0xabc123", "status": "success"}
-        mock_post.return_value = mock_response
+        mock_response.content = orjson.dumps({"tx_hash": "0xabc123", "status": "success"})
+        self.mock_post.return_value = mock_response
         
         result = self.client.execute_trade(
             from_token="0x123",
@@ -80,27 +107,139 @@ class TestRecallTradingClient(unittest.TestCase):
         )
         
         self.assertEqual(result["status"], "success")
-        mock_post.assert_called_once()
+        self.mock_post.assert_called_once()
+        self.assertEqual(self.mock_post.call_args.kwargs["timeout"], TRADE_REQUEST_TIMEOUT)
     
     def test_health_check_success(self):
         """Test successful health check"""
-        with patch('trading_client.requests.Session.get') as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_get.return_value = mock_response
-            
-            result = self.client.health_check()
-            
-            self.assertTrue(result)
+        mock_response = Mock()
+        mock_response.status_code = 200
+        self.mock_get.return_value = mock_response
+        
+        result = self.client.health_check()
+        
+        self.assertTrue(result)
     
     def test_health_check_failure(self):
         """Test failed health check"""
-        with patch('trading_client.requests.Session.get') as mock_get:
-            mock_get.side_effect = Exception("Connection error")
-            
-            result = self.client.health_check()
+        self.mock_get.side_effect = Exception("Connection error")
+        
+        result = self.client.health_check()
+        
+        self.assertFalse(result)
+
+class TestResponseCache(unittest.TestCase):
+    
+    def setUp(self):
+        """Set up a client whose cache runs on a controllable clock"""
+        with patch('trading_client.Config') as mock_config:
+            mock_config.TRADING_SIM_API_KEY = "test_api_key"
+            mock_config.TRADING_SIM_API_URL = "https://test.api.com"
+            self.client = RecallTradingClient()
+        
+        time_patcher = patch('trading_client.time')
+        self.mock_time = time_patcher.start()
+        self.addCleanup(time_patcher.stop)
+        self.mock_time.monotonic.return_value = 0.0
+    
+    def wait_for_refresh(self, key):
+        """Block until the background refresh of key has finished"""
+        deadline = time.monotonic() + 5
+        while key in self.client._refreshing:
+            self.assertLess(time.monotonic(), deadline, "background refresh did not finish")
+            time.sleep(0.01)
+    
+    def test_fresh_hit(self):
+        """Test that an entry younger than the TTL is served without fetching"""
+        fetch = Mock(return_value="v1")
+        self.assertEqual(self.client._cached("key", 10, fetch), "v1")
+        
+        self.mock_time.monotonic.return_value = 9.0
+        
+        self.assertEqual(self.client._cached("key", 10, fetch), "v1")
+        fetch.assert_called_once()
+    
+    def test_stale_hit_refreshes_once(self):
+        """Test that a stale entry is served while exactly one background refresh runs"""
+        self.client._cached("key", 10, Mock(return_value="v1"))
+        self.mock_time.monotonic.return_value = 15.0
+        
+        release = threading.Event()
+        def slow_fetch():
+            release.wait(5)
+            return "v2"
+        fetch = Mock(side_effect=slow_fetch)
+        
+        self.assertEqual(self.client._cached("key", 10, fetch), "v1")
+        self.assertEqual(self.client._cached("key", 10, fetch), "v1")
+        release.set()
+        self.wait_for_refresh("key")
+        
+        fetch.assert_called_once()
+        self.assertEqual(self.client._cached("key", 10, fetch), "v2")
+    
+    def test_failed_refresh_keeps_stale_value(self):
+        """Test that a failing background refresh leaves the stale entry in place"""
+        self.client._cached("key", 10, Mock(return_value="v1"))
+        self.mock_time.monotonic.return_value = 15.0
+        fetch = Mock(side_effect=Exception("Connection error"))
+        
+        self.assertEqual(self.client._cached("key", 10, fetch), "v1")
+        self.wait_for_refresh("key")
+        
+        fetch.assert_called_once()
+        self.assertEqual(self.client._cache["key"], (0.0, "v1"))
+    
+    def test_portfolio_not_served_stale(self):
+        """Test that a portfolio past its TTL is refetched before being returned"""
+        fetch = Mock(side_effect=[{"totalValue": 1}, {"totalValue": 2}])
+        with patch.object(self.client, '_fetch_portfolio', fetch):
+            self.client.get_portfolio()
+            self.mock_time.monotonic.return_value = 45.0
             
-            self.assertFalse(result)
+            self.assertEqual(self.client.get_portfolio(), {"totalValue": 2})
+        
+        self.assertEqual(fetch.call_count, 2)
+        self.assertEqual(self.client._refreshing, set())
+    
+    def test_invalidation_during_fetch_discards_result(self):
+        """Test that a fetch overtaken by an invalidation does not repopulate the cache"""
+        def fetch():
+            with self.client._cache_lock:
+                self.client._invalidate("key")
+            return "pre-trade"
+        
+        self.assertEqual(self.client._cached("key", 10, fetch), "pre-trade")
+        self.assertNotIn("key", self.client._cache)
+    
+    def test_invalidation_during_refresh_discards_result(self):
+        """Test that a background refresh started before an invalidation is dropped"""
+        self.client._cached("key", 10, Mock(return_value="v1"))
+        self.mock_time.monotonic.return_value = 15.0
+        
+        release = threading.Event()
+        def slow_fetch():
+            release.wait(5)
+            return "pre-trade"
+        
+        self.client._cached("key", 10, slow_fetch)
+        with self.client._cache_lock:
+            self.client._invalidate("key")
+        release.set()
+        self.wait_for_refresh("key")
+        
+        self.assertNotIn("key", self.client._cache)
+    
+    def test_lru_eviction_at_capacity(self):
+        """Test that the least recently used entry is evicted beyond MAX_CACHE_ENTRIES"""
+        with patch('trading_client.MAX_CACHE_ENTRIES', 2):
+            self.client._cached("a", 10, Mock(return_value=1))
+            self.client._cached("b", 10, Mock(return_value=2))
+            # Touch "a" so "b" becomes the least recently used
+            self.client._cached("a", 10, Mock(return_value=1))
+            self.client._cached("c", 10, Mock(return_value=3))
+        
+        self.assertEqual(list(self.client._cache), ["a", "c"])
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,89 @@
+import unittest
+import sys
+import os
+import numpy as np
+
+# Add repo root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.trading_strategy import SharedPriceStore, PRICE_SAMPLE_INTERVAL
+from src.token_config import TokenInfo
+
+TOKENS = (
+    TokenInfo("AAA", "0xaaa", "ethereum", 18, "major", True, "medium"),
+    TokenInfo("BBB", "0xbbb", "ethereum", 18, "meme", True, "high"),
+)
+
+class TestSharedPriceStore(unittest.TestCase):
+    
+    def setUp(self):
+        """Set up a store holding three ticks at one tick per PRICE_SAMPLE_INTERVAL"""
+        self.store = SharedPriceStore(lookback_hours=3 * PRICE_SAMPLE_INTERVAL / 3600)
+        self.rows = self.store.rows(TOKENS)
+    
+    def record(self, tick, a, b=None):
+        self.store.record(TOKENS, {"0xaaa": a, "0xbbb": b}, tick * PRICE_SAMPLE_INTERVAL)
+    
+    def window(self, cutoff_tick):
+        return self.store.window(self.rows, cutoff_tick * PRICE_SAMPLE_INTERVAL)
+    
+    def test_window_after_wrap_is_oldest_first(self):
+        """Test that ticks come back in time order once the ring has wrapped"""
+        for tick in range(5):
+            self.record(tick, float(tick + 1))
+        
+        # Ticks 0 and 1 were overwritten; 2, 3, 4 remain
+        np.testing.assert_array_equal(self.window(-1)[0], [3.0, 4.0, 5.0])
+        self.assertEqual(self.store._matrix.shape[1], 3)
+    
+    def test_cutoff_excludes_ticks_at_or_before_it(self):
+        """Test that only ticks strictly newer than the cutoff are returned"""
+        for tick in range(5):
+            self.record(tick, float(tick + 1))
+        
+        np.testing.assert_array_equal(self.window(3)[0], [5.0])
+        np.testing.assert_array_equal(self.window(2.5)[0], [4.0, 5.0])
+        self.assertEqual(self.window(4).shape, (2, 0))
+    
+    def test_live_start_and_length(self):
+        """Test the physical start column and length of the live ticks before and after wrapping"""
+        self.record(0, 1.0)
+        self.record(1, 2.0)
+        self.assertEqual(self.store._live(-1), (0, 2))
+        
+        self.record(2, 3.0)
+        self.record(3, 4.0)
+        # Column 0 now holds tick 3, so the oldest live tick (1) is in column 1
+        self.assertEqual(self.store._live(-1), (1, 3))
+        self.assertEqual(self.store._live(2 * PRICE_SAMPLE_INTERVAL), (0, 1))
+    
+    def test_missing_prices_are_nan(self):
+        """Test that missing or non-positive prices are stored as NaN"""
+        self.record(0, 1.0, None)
+        self.record(1, 0.0, 2.0)
+        
+        window = self.window(-1)
+        
+        self.assertTrue(np.isnan(window[1, 0]))
+        self.assertTrue(np.isnan(window[0, 1]))
+        self.assertEqual(window[1, 1], 2.0)
+    
+    def test_fast_sampling_grows_instead_of_shrinking_window(self):
+        """Test that sampling faster than PRICE_SAMPLE_INTERVAL keeps the whole lookback"""
+        # Ten ticks inside a three-interval lookback
+        for step in range(10):
+            self.record(step * 0.25, float(step + 1))
+        
+        self.assertGreaterEqual(self.store._matrix.shape[1], 10)
+        np.testing.assert_array_equal(self.window(-1)[0], np.arange(1.0, 11.0))
+        
+        # Once older ticks leave the window they are overwritten again
+        capacity = self.store._matrix.shape[1]
+        for tick in range(10, 30):
+            self.record(tick, float(tick))
+        
+        self.assertEqual(self.store._matrix.shape[1], capacity)
+        np.testing.assert_array_equal(self.window(26)[0], [27.0, 28.0, 29.0])
+
+if __name__ == '__main__':
+    unittest.main()